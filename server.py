@@ -127,7 +127,7 @@ class APIRequestHandler(SimpleHTTPRequestHandler):
             }
             
             self.wfile.write(json.dumps(api_response).encode('utf-8'))
-            logger.info(f"Recommendation query: query='{user_query}', top_k={result_count}, results={recommendation_output['total_results']}")
+            logger.info("Recommendation query: query='%s', top_k=%s, results=%d", user_query, result_count, recommendation_output['total_results'])
             
         except json.JSONDecodeError as json_error:
             logger.error(f"Malformed JSON in request: {str(json_error)}")
@@ -159,7 +159,7 @@ class APIRequestHandler(SimpleHTTPRequestHandler):
             }
             
             self.wfile.write(json.dumps(api_response).encode('utf-8'))
-            logger.info(f"All destinations request: returned {len(all_destinations)} destinations")
+            logger.info("All destinations request: returned %d destinations", len(all_destinations))
             
         except Exception as retrieval_error:
             logger.error(f"Error retrieving destinations: {str(retrieval_error)}")
@@ -212,7 +212,7 @@ class APIRequestHandler(SimpleHTTPRequestHandler):
     
     def log_message(self, format: str, *args) -> None:
         """Log request information with timestamp"""
-        logger.info(f"[{self.client_address[0]}] {format % args}")
+        logger.info("[%s] %s", self.client_address[0], format % args)
 
 
 # Set up recommendation engine globally
@@ -10,12 +10,15 @@ Delivers rapid retrieval and text similarity analysis through:
 Development Team: Destination Discovery Platform
 Release: 2.0
 """
+import functools
 import json
 import logging
 import math
 import re
+import sys
+from array import array
 from collections import defaultdict
-from typing import Dict, List, Set, Optional
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,23 @@ class TravelSpotIndexer:
     # Shortest acceptable word length for indexing
     SHORTEST_WORD_LEN = 2
     
+    # Maximum number of out-of-vocabulary query terms whose match positions are kept
+    TERM_MATCH_CACHE_SIZE = 1024
+    
+    # Destination category tiers: (boost, title keywords), checked in order
+    CATEGORY_TIERS = (
+        (0.9, ('beach', 'backwater', 'spiritual', 'devotion')),           # Primary categories
+        (0.85, ('hill', 'mountain', 'snow', 'leh', 'ladakh', 'yoga')),    # Secondary categories
+        (0.75, ('night', 'life', 'city', 'tour'))                         # Specialty keywords
+    )
+    DEFAULT_CATEGORY_BOOST = 0.5  # Generic title
+    
+    # One capture group per tier inside a lookahead, so a single scan reports
+    # every (possibly overlapping) keyword position tagged with its tier
+    _CATEGORY_TIER_PATTERN = re.compile(
+        '(?=' + '|'.join('(' + '|'.join(tier_keywords) + ')' for _, tier_keywords in CATEGORY_TIERS) + ')'
+    )
+    
     def __init__(self):
         """Set up empty data structures"""
         self.reverse_term_map = defaultdict(set)  # word -> destination ID collection
@@ -43,7 +63,28 @@ class TravelSpotIndexer:
         self.term_occurrence_counts = defaultdict(int)  # word -> occurrence count
         self.total_destination_count = 0
         self.source_file_path = None
-        self._idf_lookup_cache = {}  # Cached IDF computations
+        self.index_version = 0  # Bumped on every build_index(); lets callers invalidate caches
+        self._idf_by_term = {}  # word -> IDF, precomputed for the whole vocabulary on build
+        self._term_match_postings = {}  # indexed word -> (title, mood, description) match positions
+        # Per-instance LRU cache for query terms outside the indexed vocabulary
+        self._cached_term_matches = functools.lru_cache(maxsize=self.TERM_MATCH_CACHE_SIZE)(self._scan_term_matches)
+        
+        # Column (struct-of-arrays) view of destination_info, aligned by position
+        self.spot_id_column = []
+        self.budget_min_column = []
+        self.budget_max_column = []
+        self.duration_column = []
+        self.distance_column = []
+        self.rating_column = array('d')
+        self.category_boost_column = array('d')
+        self.metadata_column = []  # position -> destination info dictionary
+        self.position_by_id = {}  # destination ID -> column position
+        
+        # Tag bitmasks: every distinct mood / best month owns one bit position
+        self.mood_bit_positions = {}  # mood tag -> bit position
+        self.month_bit_positions = {}  # month name -> bit position
+        self.mood_mask_column = []  # position -> int bitmask of mood tags
+        self.month_mask_column = []  # position -> int bitmask of best months
     
     def load_dataset(self, filepath: str) -> None:
         """
@@ -108,37 +149,170 @@ class TravelSpotIndexer:
         self.destination_info.clear()
         self.vibe_catalog.clear()
         self.term_occurrence_counts.clear()
-        self._idf_lookup_cache.clear()  # Flush cache on rebuild
+        self._cached_term_matches.cache_clear()
         logger.debug("Constructing reverse index for all destinations")
         
         for destination_record in self.raw_destination_list:
             destination_identifier = destination_record['id']
             
-            # Cache metadata for rapid access
-            self.destination_info[destination_identifier] = {
+            # Cache metadata for rapid access; optional fields are normalised here so
+            # downstream code can index them directly without .get() defaults.
+            # Mood tags are lowercased and interned, so every destination shares one
+            # string object per tag and tag comparisons short-circuit on identity.
+            destination_metadata = {
                 'name': destination_record['name'],
-                'mood': destination_record['mood'],
+                'mood': [sys.intern(mood_tag.lower()) for mood_tag in destination_record.get('mood') or []],
                 'budget_min': destination_record['budget_min'],
                 'budget_max': destination_record['budget_max'],
                 'duration_days': destination_record['duration_days'],
                 'distance_km': destination_record['distance_km'],
                 'rating': destination_record['rating'],
-                'description': destination_record['description'],
-                'best_months': destination_record.get('best_months', [])
+                'description': destination_record.get('description') or '',
+                'best_months': destination_record.get('best_months') or []
             }
+            self._attach_derived_fields(destination_metadata)
+            self.destination_info[destination_identifier] = destination_metadata
             
             # Build atmosphere-based lookup
-            for atmosphere_tag in destination_record['mood']:
-                self.vibe_catalog[atmosphere_tag.lower()].add(destination_identifier)
+            for atmosphere_tag in destination_metadata['mood']:
+                self.vibe_catalog[atmosphere_tag].add(destination_identifier)
             
             # Process text content (title + details)
-            combined_text = (destination_record['name'] + ' ' + destination_record['description']).lower()
+            combined_text = destination_metadata['_name_lower'] + ' ' + destination_metadata['_description_lower']
             word_tokens = self._break_into_words(combined_text)
             
             # Populate reverse index (deduplicate with set)
             for unique_word in set(word_tokens):
                 self.reverse_term_map[unique_word].add(destination_identifier)
                 self.term_occurrence_counts[unique_word] += 1
+        
+        # IDF only depends on document frequencies, so compute the whole vocabulary once
+        self._idf_by_term = {
+            word: math.log(self.total_destination_count / occurrence_count)
+            for word, occurrence_count in self.term_occurrence_counts.items()
+        }
+        
+        self._build_columns()
+        
+        # Field postings for every indexed word and mood tag, so common query terms
+        # never scan the catalog at query time
+        self._term_match_postings = {
+            word: self._scan_term_matches(word)
+            for word in self.reverse_term_map.keys() | self.vibe_catalog.keys()
+        }
+        self.index_version += 1
+    
+    def _attach_derived_fields(self, destination_metadata: Dict) -> None:
+        """
+        Precompute query-independent text fields used during scoring and display.
+        
+        Stored under underscore-prefixed keys so ranking never lowercases or
+        re-scans the same destination text on every query.
+        
+        Args:
+            destination_metadata: Destination info dictionary to extend in place
+        """
+        name_lower = destination_metadata['name'].lower()
+        destination_metadata['_name_lower'] = name_lower
+        destination_metadata['_description_lower'] = destination_metadata['description'].lower()
+        destination_metadata['_mood_text'] = ' '.join(destination_metadata['mood']).lower()
+        destination_metadata['_mood_set'] = frozenset(destination_metadata['mood'])
+        destination_metadata['_best_months_set'] = frozenset(destination_metadata['best_months'])
+        destination_metadata['_category_boost'] = self._classify_category(name_lower)
+        destination_metadata['_budget_range'] = f"₹{destination_metadata['budget_min']}-{destination_metadata['budget_max']}"
+        destination_metadata['_duration_label'] = f"{destination_metadata['duration_days']} days"
+        destination_metadata['_distance_label'] = f"{destination_metadata['distance_km']} km"
+    
+    def _classify_category(self, name_lower: str) -> float:
+        """
+        Map a lowercased destination title to its category boost.
+        
+        Args:
+            name_lower: Lowercased destination title
+            
+        Returns:
+            Boost of the first tier with a keyword in the title, else the default
+        """
+        best_tier = min(
+            (match.lastindex for match in self._CATEGORY_TIER_PATTERN.finditer(name_lower)),
+            default=None
+        )
+        if best_tier is None:
+            return self.DEFAULT_CATEGORY_BOOST
+        return self.CATEGORY_TIERS[best_tier - 1][0]
+    
+    def _build_columns(self) -> None:
+        """
+        Lay destination_info out as parallel columns for whole-catalog scoring.
+        
+        Position i of every column describes the same destination, so the ranker
+        can sweep numeric fields with zip() instead of per-destination dict lookups.
+        Ids, budgets, durations and distances are plain lists holding the dataset's
+        values unchanged, so floats (e.g. 2500.0), non-int ids and large values work
+        exactly as they do in destination_info.
+        """
+        self.spot_id_column = list(self.destination_info.keys())
+        self.metadata_column = list(self.destination_info.values())
+        self.position_by_id = {spot_id: position for position, spot_id in enumerate(self.spot_id_column)}
+        self.budget_min_column = [info['budget_min'] for info in self.metadata_column]
+        self.budget_max_column = [info['budget_max'] for info in self.metadata_column]
+        self.duration_column = [info['duration_days'] for info in self.metadata_column]
+        self.distance_column = [info['distance_km'] for info in self.metadata_column]
+        self.rating_column = array('d', (info['rating'] for info in self.metadata_column))
+        self.category_boost_column = array('d', (info['_category_boost'] for info in self.metadata_column))
+        
+        self.mood_bit_positions = self._assign_bit_positions(info['mood'] for info in self.metadata_column)
+        self.month_bit_positions = self._assign_bit_positions(info['best_months'] for info in self.metadata_column)
+        self.mood_mask_column = [self.encode_moods(info['mood']) for info in self.metadata_column]
+        self.month_mask_column = [self.encode_months(info['best_months']) for info in self.metadata_column]
+    
+    @staticmethod
+    def _assign_bit_positions(tag_lists) -> Dict[str, int]:
+        """
+        Give every distinct tag a stable bit position (sorted for determinism).
+        
+        Args:
+            tag_lists: Iterable of per-destination tag lists
+            
+        Returns:
+            Dictionary mapping tag -> bit position
+        """
+        distinct_tags = sorted({tag for tag_list in tag_lists for tag in tag_list})
+        return {tag: bit for bit, tag in enumerate(distinct_tags)}
+    
+    def encode_moods(self, moods: List[str]) -> int:
+        """
+        Encode mood tags as a bitmask; tags never seen in the catalog are dropped.
+        
+        Args:
+            moods: Lowercase mood tags (as stored by build_index)
+            
+        Returns:
+            Integer bitmask over mood_bit_positions
+        """
+        return self._encode_tags(moods, self.mood_bit_positions)
+    
+    def encode_months(self, months: List[str]) -> int:
+        """
+        Encode month names as a bitmask; months never seen in the catalog are dropped.
+        
+        Args:
+            months: Month names (exact, case-sensitive as stored)
+            
+        Returns:
+            Integer bitmask over month_bit_positions
+        """
+        return self._encode_tags(months, self.month_bit_positions)
+    
+    @staticmethod
+    def _encode_tags(tags: List[str], bit_positions: Dict[str, int]) -> int:
+        """OR together the bits of all known tags"""
+        tag_mask = 0
+        for tag in tags:
+            bit = bit_positions.get(tag)
+            if bit is not None:
+                tag_mask |= 1 << bit
+        return tag_mask
     
     def _break_into_words(self, text_input: str) -> List[str]:
         """
@@ -190,7 +364,7 @@ class TravelSpotIndexer:
         Formula: IDF = log(total_destinations / destinations_containing_term)
         
         Higher values indicate more distinctive/rare terms.
-        Computations are cached to improve performance.
+        Values are precomputed for every indexed word by build_index().
         
         Args:
             term: Word to analyze
@@ -198,18 +372,50 @@ class TravelSpotIndexer:
         Returns:
             IDF weight (0.0 if term not indexed)
         """
-        # Use cached value if available
-        if term in self._idf_lookup_cache:
-            return self._idf_lookup_cache[term]
+        return self._idf_by_term.get(term, 0.0)
+    
+    def get_term_match_positions(self, term: str) -> Tuple[FrozenSet[int], FrozenSet[int], FrozenSet[int]]:
+        """
+        Find which destinations contain a search term in each text field.
+        
+        Matching is substring-based (so 'backwater' matches 'Backwaters').
+        Indexed words and mood tags are answered from postings built by
+        build_index(); any other term is scanned once and kept in a bounded
+        LRU cache, so arbitrary user input cannot grow memory without limit.
+        
+        Args:
+            term: Lowercased search term
             
-        if term not in self.term_occurrence_counts or self.total_destination_count == 0:
-            computed_value = 0.0
-        else:
-            computed_value = math.log(self.total_destination_count / self.term_occurrence_counts[term])
+        Returns:
+            Column positions matching in (title, mood tags, description)
+        """
+        match_positions = self._term_match_postings.get(term)
+        if match_positions is None:
+            match_positions = self._cached_term_matches(term)
+        return match_positions
+    
+    def _scan_term_matches(self, term: str) -> Tuple[FrozenSet[int], FrozenSet[int], FrozenSet[int]]:
+        """
+        Scan the catalog for a term in each text field (postings build / cache-miss path).
+        
+        Args:
+            term: Lowercased search term
+            
+        Returns:
+            Column positions matching in (title, mood tags, description)
+        """
+        title_matches = []
+        mood_matches = []
+        description_matches = []
+        for position, destination_metadata in enumerate(self.metadata_column):
+            if term in destination_metadata['_name_lower']:
+                title_matches.append(position)
+            if term in destination_metadata['_mood_text']:
+                mood_matches.append(position)
+            if term in destination_metadata['_description_lower']:
+                description_matches.append(position)
         
-        # Store for future lookups
-        self._idf_lookup_cache[term] = computed_value
-        return computed_value
+        return frozenset(title_matches), frozenset(mood_matches), frozenset(description_matches)
     
     def get_indexed_spots(self) -> Dict:
         """
@@ -12,10 +12,98 @@ Core Capabilities:
 - Travel range parsing
 - Optimal timing identification
 """
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import functools
 import re
 
 
+# Filter template copied for every query; list-valued fields are filled in
+# fresh by _new_filter_set() so no list object is ever shared between queries
+_EMPTY_CONSTRAINTS = {
+    'budget_min': None,  # Lower financial bound
+    'budget_max': None,
+    'mood': None,
+    'duration_days': None,
+    'distance_km': None,
+    'place_name': None,
+    'best_months': None,
+    'query_terms': None
+}
+
+# Words that never become content search terms
+_FILLER_WORDS = frozenset({
+    'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'from', 'by', 'as', 'is', 'are', 'have', 'has', 'be',
+    'can', 'i', 'you', 'we', 'they', 'what', 'where', 'when', 'why', 'how',
+    'please', 'find', 'show', 'get', 'give', 'tell', 'me', 'my', 'want',
+    # Budget-related words that shouldn't be search terms
+    'budget', 'rupees', 'rs', 'inr', 'price', 'cost', 'under', 'upto', 'between',
+    # Duration-related words
+    'days', 'day', 'week', 'weeks', 'month', 'months',
+    # Distance-related words
+    'km', 'kilometers', 'distance', 'away', 'far', 'near', 'within'
+})
+
+# Simple singularization map for common travel terms
+_SINGULAR_FORMS = {
+    'mountains': 'mountain',
+    'hills': 'hill',
+    'beaches': 'beach',
+    'temples': 'temple',
+    'caves': 'cave',
+    'valleys': 'valley',
+    'lakes': 'lake',
+    'waterfalls': 'waterfall',
+    'forests': 'forest',
+    'islands': 'island',
+    'monuments': 'monument'
+}
+
+# Month and season keywords -> months they stand for
+_TIMING_KEYWORDS = {
+    'january': ('january',),
+    'february': ('february',),
+    'march': ('march',),
+    'april': ('april',),
+    'may': ('may',),
+    'june': ('june',),
+    'july': ('july',),
+    'august': ('august',),
+    'september': ('september',),
+    'october': ('october',),
+    'november': ('november',),
+    'december': ('december',),
+    'winter': ('december', 'january', 'february'),
+    'summer': ('march', 'april', 'may', 'june'),
+    'monsoon': ('june', 'july', 'august', 'september'),
+    'autumn': ('september', 'october', 'november'),
+    'season': ()  # Generic season indicator adds no specific months
+}
+
+def _build_vibe_matcher(lexicon: Dict[str, List[str]]):
+    """
+    Compile the vibe lexicon into a keyword -> vibe map and one alternation regex.
+    
+    Keywords are ordered longest-first so 'trekking' wins over 'trek', and are
+    anchored at a word start so 'art' no longer fires inside 'party' while
+    plurals such as 'hills' still match 'hill'.
+    
+    Args:
+        lexicon: Vibe category -> keyword list mapping
+        
+    Returns:
+        Tuple of (keyword -> vibe dictionary, compiled pattern)
+    """
+    keyword_to_vibe = {}
+    for vibe_category, keyword_list in lexicon.items():
+        for keyword in keyword_list:
+            keyword_to_vibe.setdefault(keyword, vibe_category)
+    
+    ordered_keywords = sorted(keyword_to_vibe, key=len, reverse=True)
+    keyword_pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, ordered_keywords)) + ')', re.ASCII)
+    return keyword_to_vibe, keyword_pattern
+
+
 class QueryProcessor:
     """
     Interprets user search requests and builds structured filter criteria.
@@ -34,6 +122,9 @@ class QueryProcessor:
         'romantic': ['romantic', 'couple', 'honeymoon', 'love']
     }
     
+    # Single-pass matcher over every VIBE_LEXICON keyword
+    _VIBE_KEYWORDS, _VIBE_PATTERN = _build_vibe_matcher(VIBE_LEXICON)
+    
     # Location aliases for popular destinations
     DESTINATION_ALIASES = {
         'manali': 'Manali Hill Station',
@@ -52,11 +143,40 @@ class QueryProcessor:
         'tirupathi': 'Tirupathi Spiritual Temple'
     }
     
+    # Extraction patterns, compiled once. Queries are lowercased Latin text, so
+    # re.ASCII keeps \d and \s to plain ASCII range checks.
+    _BUDGET_RANGE_PATTERNS = (
+        re.compile(r'(\d+)\s*-\s*(\d+)', re.ASCII),                # 1000-2000
+        re.compile(r'(\d+)\s+to\s+(\d+)', re.ASCII),               # 1000 to 2000
+        re.compile(r'between\s+(\d+)\s+and\s+(\d+)', re.ASCII),    # between 1000 and 2000
+        re.compile(r'from\s+(\d+)\s+to\s+(\d+)', re.ASCII)         # from 1000 to 2000
+    )
+    _BUDGET_SINGLE_PATTERNS = (
+        re.compile(r'(?:budget|rupees|rs|inr)\s*(?:is|of|max|maximum|limit|under|below)?\s*[:\s]*(\d+)', re.ASCII),
+        re.compile(r'(\d+)\s*(?:rupees|rs|inr)', re.ASCII),
+        re.compile(r'(?:upto|up to|within|max|maximum)\s+(?:rupees|rs)?\s*[:\s]*(\d+)', re.ASCII),
+        re.compile(r'^(\d+)$', re.ASCII),
+        # Standalone numbers (3+ digits) not followed by units (km, days, etc.)
+        re.compile(r'\b(\d{3,})\b(?!\s*(?:km|kilometers|days?|d|nights?|n|miles))', re.ASCII)
+    )
+    _DURATION_PATTERNS = (
+        re.compile(r'(\d+)\s*(?:days?|d)', re.ASCII),
+        re.compile(r'(?:for|duration)[\s:]*(\d+)\s*days?', re.ASCII)
+    )
+    _DISTANCE_PATTERNS = (
+        re.compile(r'(?:within|upto|up to|max|maximum|km)[\s:]*(\d+)\s*km', re.ASCII),
+        re.compile(r'(\d+)\s*km', re.ASCII)
+    )
+    
+    # Maximum number of distinct query texts whose significant terms are memoised
+    TERM_CACHE_SIZE = 1024
+    
     def __init__(self):
         """Set up the parser with empty state"""
         self.user_input = ""
         self.parsed_filters = {}
-        self._term_cache = {}  # Performance optimization for tokenization
+        # Per-instance LRU cache: normalised query text -> significant terms
+        self._term_cache = functools.lru_cache(maxsize=self.TERM_CACHE_SIZE)(self._extract_significant_terms)
     
     def _isolate_search_tokens(self) -> None:
         """
@@ -64,53 +184,36 @@ class QueryProcessor:
         
         Filters out filler words and keeps only substantive terms.
         Enables matching against destination content, not just predefined categories.
+        Repeated query texts reuse the memoised terms instead of re-tokenizing.
         """
-        filler_words = {
-            'a', 'an', 'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'from', 'by', 'as', 'is', 'are', 'have', 'has', 'be',
-            'can', 'i', 'you', 'we', 'they', 'what', 'where', 'when', 'why', 'how',
-            'please', 'find', 'show', 'get', 'give', 'tell', 'me', 'my', 'want',
-            # Budget-related words that shouldn't be search terms
-            'budget', 'rupees', 'rs', 'inr', 'price', 'cost', 'under', 'upto', 'between',
-            # Duration-related words
-            'days', 'day', 'week', 'weeks', 'month', 'months',
-            # Distance-related words  
-            'km', 'kilometers', 'distance', 'away', 'far', 'near', 'within'
-        }
+        self.parsed_filters['query_terms'] = list(self._term_cache(self.user_input))
+    
+    @staticmethod
+    def _extract_significant_terms(user_input: str) -> Tuple[str, ...]:
+        """
+        Tokenize normalised query text into deduplicated content terms.
         
+        Args:
+            user_input: Lowercased, stripped query text
+            
+        Returns:
+            Tuple of significant terms (singularized, with mountain/hill synonyms)
+        """
         # Break input into individual words
-        word_list = self.user_input.split()
+        word_list = user_input.split()
         
-        # Keep only meaningful words (not filler, length > 2, not numbers)
         # Keep only meaningful words (not filler, length > 2, not numbers)
         significant_words = []
         
-        # Simple singularization map for common travel terms
-        singular_map = {
-            'mountains': 'mountain',
-            'hills': 'hill',
-            'beaches': 'beach',
-            'temples': 'temple',
-            'caves': 'cave',
-            'valleys': 'valley',
-            'lakes': 'lake',
-            'waterfalls': 'waterfall',
-            'forests': 'forest',
-            'islands': 'island',
-            'monuments': 'monument'
-        }
-        
         for word in word_list:
             clean_word = word.strip('.,!?;:')
-            if (clean_word.lower() not in filler_words and 
+            if (clean_word.lower() not in _FILLER_WORDS and 
                 len(clean_word) > 2 and 
                 not clean_word.isdigit()):
                 
                 # Apply singularization
-                if clean_word.lower() in singular_map:
-                    clean_word = singular_map[clean_word.lower()]
-                elif clean_word.lower().endswith('s') and clean_word.lower()[:-1] in singular_map.values():
-                     pass 
+                if clean_word.lower() in _SINGULAR_FORMS:
+                    clean_word = _SINGULAR_FORMS[clean_word.lower()]
                 
                 significant_words.append(clean_word)
                 
@@ -120,54 +223,41 @@ class QueryProcessor:
                 elif clean_word == 'hill':
                     significant_words.append('mountain')
         
-        self.parsed_filters['query_terms'] = list(set(significant_words))  # Deduplicate
+        return tuple(set(significant_words))  # Deduplicate
     
     def _identify_destination(self) -> None:
         """
         Detect specific location mentions in the user's request.
         
         Scans for recognized destination names and maps them to canonical forms.
+        When several aliases occur, the one declared first in DESTINATION_ALIASES wins.
         """
+        query_text = self.user_input  # already lowercased by process_query()
         for alias, canonical_name in self.DESTINATION_ALIASES.items():
-            if alias in self.user_input.lower():
+            if alias in query_text:
                 self.parsed_filters['place_name'] = canonical_name
                 return
     
     def _parse_timing_preferences(self) -> None:
         """Identify preferred travel months or seasons from user input"""
-        timing_map = {
-            'january': 'january',
-            'february': 'february',
-            'march': 'march',
-            'april': 'april',
-            'may': 'may',
-            'june': 'june',
-            'july': 'july',
-            'august': 'august',
-            'september': 'september',
-            'october': 'october',
-            'november': 'november',
-            'december': 'december',
-            'winter': ['december', 'january', 'february'],
-            'summer': ['march', 'april', 'may', 'june'],
-            'monsoon': ['june', 'july', 'august', 'september'],
-            'autumn': ['september', 'october', 'november'],
-            'season': None  # Generic season indicator
-        }
-        
         detected_months = []
-        for timing_key, timing_value in timing_map.items():
+        for timing_key, timing_value in _TIMING_KEYWORDS.items():
             if timing_key in self.user_input:
-                if isinstance(timing_value, list):
-                    detected_months.extend(timing_value)
-                elif timing_value is not None:
-                    detected_months.append(timing_value)
-                # Generic 'season' doesn't add specific months
+                detected_months.extend(timing_value)
         
         if detected_months:
             self.parsed_filters['best_months'] = list(set(detected_months))  # Deduplicate
 
     
+    @staticmethod
+    def _new_filter_set() -> Dict:
+        """Copy the empty filter template and attach fresh list-valued fields"""
+        filter_set = _EMPTY_CONSTRAINTS.copy()
+        filter_set['mood'] = []
+        filter_set['best_months'] = []
+        filter_set['query_terms'] = []
+        return filter_set
+    
     def process_query(self, query: str) -> Dict:
         """
         Transform raw text query into organized search parameters.
@@ -196,16 +286,12 @@ class QueryProcessor:
         self.user_input = query.lower().strip()
         
         # Set up empty filter structure with correct data types
-        self.parsed_filters = {
-            'budget_min': None,  # Lower financial bound
-            'budget_max': None,
-            'mood': [],
-            'duration_days': None,
-            'distance_km': None,
-            'place_name': None,
-            'best_months': [],
-            'query_terms': []
-        }
+        self.parsed_filters = self._new_filter_set()
+        
+        # Fast path: a bare number (common UI input) can only be a budget limit
+        if self.user_input.isdigit() and self.user_input.isascii():
+            self.parsed_filters['budget_max'] = int(self.user_input)
+            return self.parsed_filters
         
         # Run all extraction methods
         self._isolate_search_tokens()
@@ -232,15 +318,8 @@ class QueryProcessor:
             
         # Priority 1: Look for budget RANGES first
         # Must check ranges before single values
-        range_regex_list = [
-            r'(\d+)\s*-\s*(\d+)',                          # 1000-2000
-            r'(\d+)\s+to\s+(\d+)',                         # 1000 to 2000
-            r'between\s+(\d+)\s+and\s+(\d+)',              # between 1000 and 2000
-            r'from\s+(\d+)\s+to\s+(\d+)'                   # from 1000 to 2000
-        ]
-        
-        for regex_pattern in range_regex_list:
-            range_match = re.search(regex_pattern, self.user_input)
+        for regex_pattern in self._BUDGET_RANGE_PATTERNS:
+            range_match = regex_pattern.search(self.user_input)
             if range_match:
                 try:
                     lower_bound = int(range_match.group(1))
@@ -257,17 +336,8 @@ class QueryProcessor:
 
         # Priority 2: Look for SINGLE values (upper limit)
         # Only if no range detected
-        single_value_patterns = [
-            r'(?:budget|rupees|rs|inr)\s*(?:is|of|max|maximum|limit|under|below)?\s*[:\s]*(\d+)',
-            r'(\d+)\s*(?:rupees|rs|inr)',
-            r'(?:upto|up to|within|max|maximum)\s+(?:rupees|rs)?\s*[:\s]*(\d+)',
-            r'^(\d+)$',
-            # Standalone numbers (3+ digits) not followed by units (km, days, etc.)
-            r'\b(\d{3,})\b(?!\s*(?:km|kilometers|days?|d|nights?|n|miles))'
-        ]
-        
-        for single_pattern in single_value_patterns:
-            single_match = re.search(single_pattern, self.user_input)
+        for single_pattern in self._BUDGET_SINGLE_PATTERNS:
+            single_match = single_pattern.search(self.user_input)
             if single_match:
                 try:
                     amount_str = single_match.group(1)
@@ -285,40 +355,35 @@ class QueryProcessor:
         Identify vibe/atmosphere preferences from user text.
         
         Scans for atmosphere keywords and builds list of matching vibes.
-        Leverages expanded keyword catalog for improved matching.
+        All keywords are matched in one pass of a precompiled alternation.
         """
-        detected_vibes = set()
-        
-        for vibe_category, keyword_list in self.VIBE_LEXICON.items():
-            for keyword in keyword_list:
-                if keyword in self.user_input.lower():
-                    detected_vibes.add(vibe_category)
-                    break  # Move to next vibe category
+        detected_vibes = {
+            self._VIBE_KEYWORDS[keyword]
+            for keyword in self._VIBE_PATTERN.findall(self.user_input)
+        }
         
-        self.parsed_filters['mood'] = list(detected_vibes) if detected_vibes else []
+        self.parsed_filters['mood'] = list(detected_vibes)
     
     def _parse_trip_length(self) -> None:
         """Extract trip duration from user input"""
-        duration_patterns = [
-            r'(\d+)\s*(?:days?|d)',
-            r'(?:for|duration)[\s:]*(\d+)\s*days?'
-        ]
+        # Every duration pattern needs a 'd' (days/d) - skip regex work otherwise
+        if 'd' not in self.user_input:
+            return
         
-        for duration_regex in duration_patterns:
-            duration_match = re.search(duration_regex, self.user_input)
+        for duration_regex in self._DURATION_PATTERNS:
+            duration_match = duration_regex.search(self.user_input)
             if duration_match:
                 self.parsed_filters['duration_days'] = int(duration_match.group(1))
                 break
     
     def _parse_travel_range(self) -> None:
         """Extract maximum travel distance from user input"""
-        distance_patterns = [
-            r'(?:within|upto|up to|max|maximum|km)[\s:]*(\d+)\s*km',
-            r'(\d+)\s*km',
-        ]
+        # Every distance pattern ends in 'km' - skip regex work otherwise
+        if 'km' not in self.user_input:
+            return
         
-        for distance_regex in distance_patterns:
-            distance_match = re.search(distance_regex, self.user_input)
+        for distance_regex in self._DISTANCE_PATTERNS:
+            distance_match = distance_regex.search(self.user_input)
             if distance_match:
                 self.parsed_filters['distance_km'] = int(distance_match.group(1))
                 break
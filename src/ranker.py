@@ -2,13 +2,26 @@
 ScoringEngine Module: Implements relevance computation and retrieval algorithms
 Utilizes TF-IDF and filter-based matching for destination relevance scoring
 """
+import functools
+import heapq
 import logging
 import math
-from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from itertools import compress, repeat
+from typing import Collection, Dict, FrozenSet, List, Tuple, Optional
 from src.indexer import TravelSpotIndexer
 
 logger = logging.getLogger(__name__)
 
+# Location/type keywords: when present in a query they MUST match the destination,
+# unlike mood keywords
+_LOCATION_TYPE_KEYWORDS = frozenset({
+    'mountain', 'mountains', 'hill', 'hills', 'beach', 'beaches',
+    'desert', 'island', 'islands', 'valley', 'lake', 'backwater',
+    'backwaters', 'forest', 'jungle', 'snow', 'temple', 'palace',
+    'fort', 'city', 'village', 'waterfall', 'river', 'sea', 'ocean'
+})
+
 
 class TravelSpotRanker:
     """
@@ -16,10 +29,52 @@ class TravelSpotRanker:
     Combines filter satisfaction with relevance weighting
     """
     
+    # Maximum number of distinct (constraints, top_k) rankings kept per ranker
+    RANKING_CACHE_SIZE = 512
+    
+    # Maximum number of distinct query-term sets whose content scores are kept
+    CONTENT_CACHE_SIZE = 256
+    
+    # Component weights shared by ranking and explanations (sum to 1.0)
+    COMPONENT_WEIGHTS = {
+        'content': 0.15,            # Content match in title/atmosphere/details
+        'budget': 0.25,             # Financial fit - highest impact
+        'mood': 0.20,               # Atmosphere match
+        'duration': 0.20,           # Trip length - primary when specified
+        'destination_type': 0.12,   # Destination category boost
+        'best_months': 0.05,        # Timing preferences
+        'distance': 0.03,           # Travel range
+    }
+    
+    # Pre-weighted contribution of a component the user did not constrain (neutral score 0.5)
+    _NEUTRAL_CONTRIBUTIONS = {
+        component_name: 0.5 * component_weight
+        for component_name, component_weight in COMPONENT_WEIGHTS.items()
+    }
+    
+    # Explanation text for components the user did not constrain (scored at 0.5)
+    _DEFAULT_COMPONENT_REASONS = {
+        'content': "No search terms (default score)",
+        'budget': "No budget specified (default score)",
+        'mood': "No mood specified (default score)",
+        'duration': "No duration specified (default score)",
+        'destination_type': "Destination type (default score)",
+        'best_months': "No months specified (default score)",
+        'distance': "No distance specified (default score)",
+    }
+    
+    # Trip length fit indexed by |spot_duration - user_duration| (0..4 days)
+    _TRIP_LENGTH_FIT_TABLE = (1.0, 0.90, 0.75, 0.55, 0.40)
+    
     def __init__(self, indexer: TravelSpotIndexer):
         self.data_indexer = indexer
+        # Per-instance LRU cache of finished rankings (keyed by index version too)
+        self._cached_rankings = functools.lru_cache(maxsize=self.RANKING_CACHE_SIZE)(self._rank_frozen_constraints)
+        # Content scores depend only on the query terms, so they are shared across
+        # rankings that differ in budget, mood, duration, etc.
+        self._cached_content_scores = functools.lru_cache(maxsize=self.CONTENT_CACHE_SIZE)(self._content_scores_for_version)
     
-    def rank_spots(self, constraints: Dict, top_k: int = 10) -> List[Tuple[int, float, Dict]]:
+    def rank_spots(self, constraints: Dict, top_k: int = 10, explain: bool = False):
         """
         Compute relevance scores for all destinations based on user criteria.
         
@@ -29,51 +84,121 @@ class TravelSpotRanker:
         Args:
             constraints: Parsed user filter criteria dictionary
             top_k: Suggested result count (used as guidance, not strict limit)
+            explain: Also return the raw component scores computed while ranking,
+                     ready to pass to explain_score() (bypasses the ranking cache)
             
         Returns:
-            List of (destination_id, relevance_score, metadata) tuples ordered by score descending
+            List of (destination_id, relevance_score, metadata) tuples ordered by score descending.
+            With explain=True, a (results, component_scores) pair where component_scores
+            maps destination_id -> {component name: raw score} for active components.
             
         Raises:
             ValueError: If top_k is below 1
         """
         if top_k < 1:
             raise ValueError("top_k value must be at least 1")
+        
+        if explain:
+            component_scores = {}
+            ranked_results = self._rank_constraints(constraints, top_k, component_scores)
+            return list(ranked_results), component_scores
+        
+        # Ranking is a pure function of (index state, constraints, top_k)
+        cached_results = self._cached_rankings(
+            self.data_indexer.index_version, self._freeze_constraints(constraints), top_k
+        )
+        return list(cached_results)
+    
+    @staticmethod
+    def _freeze_constraints(constraints: Dict) -> Tuple:
+        """
+        Convert a constraints dictionary into a canonical hashable cache key.
+        
+        List values are sorted into tuples; every scoring component treats them
+        as unordered collections, so ordering never changes the ranking.
+        """
+        return tuple(sorted(
+            (field_name, tuple(sorted(field_value)) if isinstance(field_value, (list, tuple, set, frozenset)) else field_value)
+            for field_name, field_value in constraints.items()
+        ))
+    
+    def _rank_frozen_constraints(self, index_version: int, frozen_constraints: Tuple, top_k: int) -> Tuple:
+        """
+        Rank destinations for a frozen constraints key (cache-miss path).
+        
+        Args:
+            index_version: Indexer build counter, so rebuilds never hit stale entries
+            frozen_constraints: Output of _freeze_constraints()
+            top_k: Maximum number of results
+            
+        Returns:
+            Tuple of (destination_id, relevance_score, metadata) tuples
+        """
+        return self._rank_constraints(dict(frozen_constraints), top_k)
+    
+    def _rank_constraints(self, constraints: Dict, top_k: int, component_sink: Optional[Dict] = None) -> Tuple:
+        """
+        Score, threshold and select the top destinations for a constraints dictionary.
+        
+        Args:
+            constraints: Parsed user filter criteria dictionary
+            top_k: Maximum number of results
+            component_sink: Optional dict filled with destination_id -> raw component scores
             
+        Returns:
+            Tuple of (destination_id, relevance_score, metadata) tuples
+        """
         # Minimum relevance threshold: Only display results with substantial relevance
         # 0.4 = 40% relevance (calibrated for weighted scoring approach)
         MIN_RELEVANCE_THRESHOLD = 0.4
         
-        relevance_scores = {}
-        
-        for destination_id, destination_data in self.data_indexer.destination_info.items():
-            computed_score = self._compute_destination_relevance(destination_id, destination_data, constraints)
-            relevance_scores[destination_id] = computed_score
-        
-        # Order by score (descending), use rating as tiebreaker
-        sorted_results = sorted(relevance_scores.items(), 
-                       key=lambda item: (item[1], self.data_indexer.get_spot_by_id(item[0])['rating']),
-                       reverse=True)
-        
-        final_results = []
-        for destination_id, relevance_score in sorted_results:
-            # Enforce Top-K limit
-            if len(final_results) >= top_k:
-                break
-                
-            # Apply relevance threshold
-            if relevance_score < MIN_RELEVANCE_THRESHOLD:
-                break  # Remaining items will have lower scores
-                
-            destination_data = self.data_indexer.get_spot_by_id(destination_id)
-            if destination_data:
-                final_results.append((destination_id, relevance_score, destination_data))
-        
-        logger.debug(f"Scored {len(final_results)} destinations with relevance >= {MIN_RELEVANCE_THRESHOLD}")
-        return final_results
+        component_columns = {} if component_sink is not None else None
+        relevance_scores = self._score_all_destinations(constraints, component_columns)
+        spot_id_column = self.data_indexer.spot_id_column
+        rating_column = self.data_indexer.rating_column
+        metadata_column = self.data_indexer.metadata_column
+        
+        # Apply relevance threshold before selection so only candidates are ranked.
+        # Candidates are pre-decorated (score, rating, -position) so the heap compares
+        # plain tuples in C; the negated position keeps earlier destinations first on ties.
+        candidates = [
+            (relevance_score, rating, -position)
+            for position, (relevance_score, rating) in enumerate(zip(relevance_scores, rating_column))
+            if relevance_score >= MIN_RELEVANCE_THRESHOLD
+        ]
+        
+        # Top-K by score (descending), use rating as tiebreaker; only K items are tracked
+        top_positions = [-negated_position for _, _, negated_position in heapq.nlargest(top_k, candidates)]
+        
+        # Metadata travels with the column position, so no id lookup is needed
+        final_results = [
+            (spot_id_column[position], relevance_scores[position], metadata_column[position])
+            for position in top_positions
+        ]
+        
+        if component_sink is not None:
+            for position in top_positions:
+                component_sink[spot_id_column[position]] = {
+                    component_name: component_column[position]
+                    for component_name, component_column in component_columns.items()
+                }
+        
+        logger.debug("Scored %d destinations with relevance >= %s", len(final_results), MIN_RELEVANCE_THRESHOLD)
+        return tuple(final_results)
     
-    def _compute_destination_relevance(self, spot_id: int, metadata: Dict, constraints: Dict) -> float:
+    def _score_all_destinations(self, constraints: Dict, component_sink: Optional[Dict] = None) -> List[float]:
         """
-        Calculate overall relevance score for a destination.
+        Calculate relevance scores for the whole catalog in one column-wise pass.
+        
+        Hard filters (budget overlap, location keywords, moods) run first and are
+        collected in a keep-mask; soft components are then computed only for the
+        destinations that survived, by sweeping the compressed column arrays.
+        Rejected destinations score 0.0. Numeric kernels are driven by map() over
+        the columns so the per-destination loop runs in C.
+        
+        The scorer is specialised per constraints shape: only active components
+        are evaluated and accumulated, while inactive ones contribute their
+        neutral 0.5 * weight through a single precomputed base constant.
         
         ADAPTIVE WEIGHTING: Weights adjust based on explicit user criteria.
         When trip length is explicitly mentioned, it becomes PRIMARY (20%).
@@ -86,119 +211,178 @@ class TravelSpotRanker:
         - Destination category (12%): Ensures correct type
         - Timing preferences (5%): Travel planning
         - Travel range (3%): Accessibility factor
-        """
-        total_score = 0.0
         
-        # Detect if trip length was explicitly mentioned (high priority signal)
-        trip_length_explicit = constraints.get('duration_days') is not None
+        Args:
+            constraints: Parsed user filter criteria dictionary
+            component_sink: Optional dict filled with component name -> {position: raw score}
+                            for every active component and kept destination
         
-        # Component 0: CONTENT/DESCRIPTION MATCHING (15% weight)
-        if constraints.get('query_terms'):
-            content_relevance = self._evaluate_content_match(metadata, constraints['query_terms'])
-            
-            # SMART FILTERING: Detect if query contains location/type keywords
-            # These MUST match the destination, unlike mood keywords
-            location_type_keywords = {
-                'mountain', 'mountains', 'hill', 'hills', 'beach', 'beaches', 
-                'desert', 'island', 'islands', 'valley', 'lake', 'backwater', 
-                'backwaters', 'forest', 'jungle', 'snow', 'temple', 'palace',
-                'fort', 'city', 'village', 'waterfall', 'river', 'sea', 'ocean'
-            }
-            
-            # Check if any query term is a location/type keyword
-            has_location_keyword = any(
-                term.lower() in location_type_keywords 
-                for term in constraints['query_terms']
-            )
-            
-            # If location keyword present but no strong match, filter out
-            # This ensures "mountain budget 5000" only shows mountains
-            # But "adventure budget 5000" can match via mood
-            if has_location_keyword and content_relevance < 0.5:
-                return 0.0  # Location keyword doesn't match - filter out
-            
-            total_score += content_relevance * 0.15
-        else:
-            total_score += 0.5 * 0.15
+        Returns:
+            Relevance scores aligned with the indexer's column positions
+        """
+        indexer = self.data_indexer
+        weights = self.COMPONENT_WEIGHTS
+        destination_count = len(indexer.spot_id_column)
+        keep_mask = [True] * destination_count
         
-        # Component 1: FINANCIAL FIT SCORE (25% weight) - Always primary
-        if constraints.get('budget_max'):
+        # ---- Phase 1: hard filters (cheap numeric checks first) ----
+        
+        # Budget overlap filter on the budget columns, before any text matching
+        user_budget_max = constraints.get('budget_max')
+        user_budget_min = constraints.get('budget_min')
+        if user_budget_max:
             # OVERLAP FILTERING: Display destinations with ANY overlap with user's financial range
-            if constraints.get('budget_min'):
-                # Verify ANY overlap between ranges
+            if user_budget_min:
                 # No overlap if: destination_max < user_min OR destination_min > user_max
-                if metadata['budget_max'] < constraints['budget_min']:
-                    return 0.0  # Destination entirely too economical
-                if metadata['budget_min'] > constraints['budget_max']:
-                    return 0.0  # Destination entirely too expensive
-                # Overlap exists - include it!
+                keep_mask = [
+                    spot_max >= user_budget_min and spot_min <= user_budget_max
+                    for spot_min, spot_max in zip(indexer.budget_min_column, indexer.budget_max_column)
+                ]
             else:
                 # Only max specified: destination must start at or below user's max
-                if metadata['budget_min'] > constraints['budget_max']:
-                    return 0.0
-
-            financial_relevance = self._evaluate_financial_fit(
-                metadata['budget_min'],
-                metadata['budget_max'],
-                constraints['budget_max'],
-                constraints.get('budget_min')
-            )
-            total_score += financial_relevance * 0.25
-        else:
-            total_score += 0.5 * 0.25
+                keep_mask = [spot_min <= user_budget_max for spot_min in indexer.budget_min_column]
+        
+        # Component 0: CONTENT/DESCRIPTION MATCHING (15% weight)
+        # Normalise once at the boundary: lowercase + dedupe, O(1) membership
+        query_terms = frozenset(term.lower() for term in constraints.get('query_terms') or ())
+        content_scores = None
+        if query_terms:
+            content_scores = self._cached_content_scores(indexer.index_version, query_terms)
+            
+            # SMART FILTERING: If location keyword present but no strong match, filter out
+            # This ensures "mountain budget 5000" only shows mountains
+            # But "adventure budget 5000" can match via mood
+            if not query_terms.isdisjoint(_LOCATION_TYPE_KEYWORDS):
+                keep_mask = [keep and content >= 0.5 for keep, content in zip(keep_mask, content_scores)]
         
         # Component 2: ATMOSPHERE SCORE (20% weight)
+        atmosphere_scores = None
         if constraints.get('mood'):
-            atmosphere_relevance = self._evaluate_atmosphere_match(metadata['mood'], constraints['mood'])
+            # Overlap = popcount of (destination mask & user mask) over distinct requested moods
+            user_moods = set(constraints['mood'])
+            user_mood_mask = indexer.encode_moods(user_moods)
+            requested_mood_count = len(user_moods)
+            atmosphere_scores = [
+                (spot_mask & user_mood_mask).bit_count() / requested_mood_count
+                for spot_mask in indexer.mood_mask_column
+            ]
             
             # STRICT MOOD FILTERING:
             # If user explicitly requested specific moods (e.g. "adventure"),
             # exclude destinations that don't match ANY of those moods.
-            if atmosphere_relevance == 0:
-                return 0.0
-                
-            total_score += atmosphere_relevance * 0.20
+            keep_mask = [keep and atmosphere != 0 for keep, atmosphere in zip(keep_mask, atmosphere_scores)]
+        
+        # ---- Phase 2: soft scores, only for destinations that passed every filter ----
+        
+        kept_positions = list(compress(range(destination_count), keep_mask))
+        relevance_scores = [0.0] * destination_count
+        if not kept_positions:
+            return relevance_scores
+        
+        def kept(column):
+            """Restrict a full-catalog column to the kept positions"""
+            return compress(column, keep_mask)
+        
+        # (name, weight, scores over kept positions) in COMPONENT_WEIGHTS order; scores is
+        # None for a component the user did not constrain (neutral 0.5 for every destination)
+        component_terms = []
+        
+        if content_scores is not None:
+            component_terms.append(('content', weights['content'], kept(content_scores)))
+        else:
+            component_terms.append(('content', weights['content'], None))
+        
+        # Component 1: FINANCIAL FIT SCORE (25% weight) - Always primary
+        if user_budget_max:
+            component_terms.append(('budget', weights['budget'], map(
+                self._evaluate_financial_fit,
+                kept(indexer.budget_min_column), kept(indexer.budget_max_column),
+                repeat(user_budget_max), repeat(user_budget_min)
+            )))
+        else:
+            component_terms.append(('budget', weights['budget'], None))
+        
+        if atmosphere_scores is not None:
+            component_terms.append(('mood', weights['mood'], kept(atmosphere_scores)))
         else:
-            total_score += 0.5 * 0.20
+            component_terms.append(('mood', weights['mood'], None))
         
         # Component 3: Trip Length Score (20% weight) - BOOSTED when explicitly specified
         # Trip length is a hard constraint when mentioned in query
-        if trip_length_explicit:
-            trip_length_relevance = self._evaluate_trip_length_fit(
-                metadata['duration_days'],
-                constraints['duration_days']
-            )
-            total_score += trip_length_relevance * 0.20
+        if constraints.get('duration_days') is not None:
+            # Few distinct durations exist, so score each once and index the table per destination
+            user_duration = constraints['duration_days']
+            trip_length_table = {
+                spot_duration: self._evaluate_trip_length_fit(spot_duration, user_duration)
+                for spot_duration in set(indexer.duration_column)
+            }
+            component_terms.append(('duration', weights['duration'], map(
+                trip_length_table.__getitem__, kept(indexer.duration_column)
+            )))
         else:
-            total_score += 0.5 * 0.20
+            component_terms.append(('duration', weights['duration'], None))
         
-        # Component 4: Destination Category Boost (12% weight)
-        category_relevance = self._evaluate_category_boost(metadata['name'], constraints)
-        total_score += category_relevance * 0.12
+        # Component 4: Destination Category Boost (12% weight) - always active, precomputed per destination
+        component_terms.append(('destination_type', weights['destination_type'], kept(indexer.category_boost_column)))
         
         # Component 5: Timing Preferences Match (5% weight)
         if constraints.get('best_months'):
-            timing_relevance = self._evaluate_timing_match(
-                metadata.get('best_months', []),
-                constraints['best_months']
-            )
-            total_score += timing_relevance * 0.05
+            user_months = set(constraints['best_months'])
+            user_month_mask = indexer.encode_months(user_months)
+            requested_month_count = len(user_months)
+            # Destinations without best months (empty mask) stay neutral (0.5)
+            component_terms.append(('best_months', weights['best_months'], [
+                (spot_mask & user_month_mask).bit_count() / requested_month_count if spot_mask else 0.5
+                for spot_mask in kept(indexer.month_mask_column)
+            ]))
         else:
-            total_score += 0.5 * 0.05
+            component_terms.append(('best_months', weights['best_months'], None))
         
         # Component 6: Travel Range Score (3% weight)
         if constraints.get('distance_km'):
-            range_relevance = self._evaluate_travel_range(
-                metadata['distance_km'],
-                constraints['distance_km']
-            )
-            total_score += range_relevance * 0.03
+            component_terms.append(('distance', weights['distance'], map(
+                self._evaluate_travel_range,
+                kept(indexer.distance_column), repeat(constraints['distance_km'])
+            )))
         else:
-            total_score += 0.5 * 0.03
+            component_terms.append(('distance', weights['distance'], None))
+        
+        # Accumulate in COMPONENT_WEIGHTS order from 0.0, matching the scalar summation
+        # bit for bit so equal scores still fall through to the rating tie-breaker.
+        # Inactive components add their precomputed neutral contribution without scoring.
+        kept_totals = [0.0] * len(kept_positions)
+        for component_name, weight, component_scores in component_terms:
+            if component_scores is None:
+                neutral_contribution = self._NEUTRAL_CONTRIBUTIONS[component_name]
+                kept_totals = [total + neutral_contribution for total in kept_totals]
+                continue
+            if component_sink is not None:
+                component_scores = list(component_scores)
+                component_sink[component_name] = dict(zip(kept_positions, component_scores))
+            kept_totals = [
+                total + component * weight
+                for total, component in zip(kept_totals, component_scores)
+            ]
+        
+        # Scatter back to catalog positions; filtered-out destinations stay at 0.0
+        for position, total in zip(kept_positions, kept_totals):
+            relevance_scores[position] = total
+        return relevance_scores
+    
+    def _content_scores_for_version(self, index_version: int, query_terms: FrozenSet[str]) -> Tuple[float, ...]:
+        """
+        Content scores for a query-term set (cache-miss path).
         
-        return total_score
+        Args:
+            index_version: Indexer build counter, so rebuilds never hit stale entries
+            query_terms: Lowercased, deduplicated search terms
+            
+        Returns:
+            Immutable content scores aligned with the indexer's column positions
+        """
+        return tuple(self._evaluate_content_match(query_terms))
     
-    def _evaluate_content_match(self, metadata: Dict, query_terms: List[str]) -> float:
+    def _evaluate_content_match(self, query_terms: FrozenSet[str]) -> List[float]:
         """
         Score based on how well search terms match the details, title, and atmosphere.
         
@@ -208,47 +392,86 @@ class TravelSpotRanker:
         - If no match: Score 0
         
         Ensures "beach" returns only "Goa Beach", not all destinations mentioning beach.
+        Each term is resolved through the indexer's term-match postings, so only
+        destinations that actually contain a term are touched.
+        
+        Args:
+            query_terms: Lowercased, deduplicated search terms
+        
+        Returns:
+            Content scores aligned with the indexer's column positions
         """
-        if not query_terms:
-            return 0.5
+        title_hits = Counter()
+        atmosphere_hits = Counter()
+        details_hits = Counter()
         
+        for search_term in query_terms:
+            title_matches, mood_matches, description_matches = \
+                self.data_indexer.get_term_match_positions(search_term)
+            
+            # A term counts once per destination: title, else atmosphere, else details
+            title_hits.update(title_matches)
+            atmosphere_hits.update(mood_matches - title_matches)
+            details_hits.update(description_matches - title_matches - mood_matches)
+        
+        total_terms = len(query_terms)
+        content_scores = [0.0] * len(self.data_indexer.metadata_column)
+        
+        # Description match is weaker - prevents false positives
+        # Example: "beach" in "hill station with beach views" description
+        for position, hit_count in details_hits.items():
+            content_scores[position] = 0.2 * (hit_count / total_terms)
+        
+        # Mood/atmosphere match is STRONG (not weak) - these are primary categorizations
+        # Example: "spiritual" matching mood=['spiritual'] should score high
+        for position, hit_count in atmosphere_hits.items():
+            content_scores[position] = 0.8 * (hit_count / total_terms)  # Changed from 0.3 to 0.8
+        
+        # STRICT SCORING:
+        # If ANY term matches title, highly relevant
+        for position, hit_count in title_hits.items():
+            # Perfect match if all terms in title
+            content_scores[position] = min(hit_count / total_terms, 1.0)
+        
+        return content_scores
+    
+    def _evaluate_content_fields(self, metadata: Dict, query_terms: FrozenSet[str]) -> float:
+        """
+        Content score for a single destination from its own text fields.
+        
+        Scalar counterpart of _evaluate_content_match() for metadata that is not
+        part of the index, using the same title > atmosphere > details rule.
+        
+        Args:
+            metadata: Destination information dictionary (name, mood, description)
+            query_terms: Lowercased, deduplicated search terms
+            
+        Returns:
+            Content score between 0.0 and 1.0
+        """
         title_lowercase = metadata['name'].lower()
-        details_lowercase = metadata.get('description', '').lower()
-        atmosphere_text = ' '.join(metadata.get('mood', [])).lower()
+        details_lowercase = (metadata.get('description') or '').lower()
+        atmosphere_text = ' '.join(metadata.get('mood') or ()).lower()
         
         title_hits = 0
-        details_hits = 0
         atmosphere_hits = 0
-        total_terms = len(query_terms)
-        
+        details_hits = 0
         for search_term in query_terms:
-            term_lowercase = search_term.lower()
-            
-            if term_lowercase in title_lowercase:
+            if search_term in title_lowercase:
                 title_hits += 1
-            elif term_lowercase in atmosphere_text:
+            elif search_term in atmosphere_text:
                 atmosphere_hits += 1
-            elif term_lowercase in details_lowercase:
+            elif search_term in details_lowercase:
                 details_hits += 1
         
-        # STRICT SCORING:
-        # If ANY term matches title, highly relevant
-        if title_hits > 0:
-            # Perfect match if all terms in title
+        total_terms = len(query_terms)
+        if title_hits:
             return min(title_hits / total_terms, 1.0)
-        
-        # Mood/atmosphere match is STRONG (not weak) - these are primary categorizations
-        # Example: "spiritual" matching mood=['spiritual'] should score high
-        if atmosphere_hits > 0:
-            return 0.8 * (atmosphere_hits / total_terms)  # Changed from 0.3 to 0.8
-        
-        # Description match is weaker - prevents false positives
-        # Example: "beach" in "hill station with beach views" description
-        if details_hits > 0:
+        if atmosphere_hits:
+            return 0.8 * (atmosphere_hits / total_terms)
+        if details_hits:
             return 0.2 * (details_hits / total_terms)
-        
-        # No match at all
-        return 0
+        return 0.0
     
     def _evaluate_category_boost(self, spot_name: str, constraints: Dict) -> float:
         """
@@ -256,30 +479,11 @@ class TravelSpotRanker:
         
         Ensures proper destination category matching. Lower weight (20%) than
         financial/atmosphere since title is mostly for categorization.
+        The tier only depends on the title, so indexed destinations carry it
+        precomputed as '_category_boost' (see TravelSpotIndexer.CATEGORY_TIERS);
+        this computes it for any other title.
         """
-        title_lowercase = spot_name.lower()
-        
-        # TIER 1: PRIMARY DESTINATION CATEGORIES - HIGH BOOST (0.9)
-        primary_keywords = ['beach', 'backwater', 'spiritual', 'devotion']
-        for keyword in primary_keywords:
-            if keyword in title_lowercase:
-                return 0.9
-        
-        # TIER 2: SECONDARY DESTINATION CATEGORIES (0.85)
-        secondary_keywords = ['hill', 'mountain', 'snow', 'leh', 'ladakh', 'yoga']
-        for keyword in secondary_keywords:
-            if keyword in title_lowercase:
-                return 0.85
-        
-        # TIER 3: SPECIALTY KEYWORDS (0.75)
-        specialty_keywords = ['night', 'life', 'city', 'tour']
-        for keyword in specialty_keywords:
-            if keyword in title_lowercase:
-                return 0.75
-        
-        # DEFAULT: Generic title (0.5)
-        # Don't heavily penalize titles without keywords
-        return 0.5
+        return self.data_indexer._classify_category(spot_name.lower())
     
     def _evaluate_timing_match(self, spot_best_months: List[str], user_months: List[str]) -> float:
         """
@@ -287,6 +491,7 @@ class TravelSpotRanker:
         If user specifies preferred timing or season, verify match with destination's optimal periods.
         
         Supports: winter, summer, monsoon, autumn, and specific months
+        Pass the destination's months as a set (metadata['_best_months_set']) for O(1) membership.
         """
         if not user_months or not spot_best_months:
             return 0.5  # Default if no timing specified
@@ -325,9 +530,8 @@ class TravelSpotRanker:
         # Scenario 2: Max Limit Query (e.g. budget 2000)
         if budget_min <= user_budget_max <= budget_max:
             # User budget within destination's range
-            # BONUS: Prioritize destinations with LOWEST budget_min (most affordable)
-            affordability_bonus = max(0, 1.0 - (budget_min / user_budget_max) * 0.1)
-            return min(1.0, 1.0 + affordability_bonus)
+            # Prioritize destinations with LOWEST budget_min (most affordable): 0.9-1.0
+            return 1.0 - (budget_min / user_budget_max) * 0.1
         elif user_budget_max < budget_min:
             # User budget too low - penalize significantly
             # (Should be filtered by strict check, but keeping for robustness)
@@ -337,10 +541,12 @@ class TravelSpotRanker:
             # This is GOOD! User can easily afford this.
             return 1.0
     
-    def _evaluate_atmosphere_match(self, spot_moods: List[str], user_moods: List[str]) -> float:
+    def _evaluate_atmosphere_match(self, spot_moods: Collection[str], user_moods: Collection[str]) -> float:
         """
         Score based on atmosphere match.
         Score = (matching atmospheres) / (total user atmospheres requested)
+        Pass the destination's moods as a set (metadata['_mood_set']) for O(1) membership;
+        lists and frozensets are both accepted.
         """
         if not user_moods:
             return 1.0
@@ -366,19 +572,14 @@ class TravelSpotRanker:
         """
         difference = abs(spot_duration - user_duration)
         
-        if difference == 0:
-            return 1.0  # Exact match - highest score
-        elif difference == 1:
-            return 0.90  # Very close
-        elif difference == 2:
-            return 0.75  # Close but not ideal
-        elif difference == 3:
-            return 0.55  # Moderately different
-        elif difference == 4:
-            return 0.40  # Significantly different
-        else:
-            # Very large difference - heavy penalty
-            return max(0.25, 1.0 - (difference * 0.12))
+        # Table lookup replaces the 0..4 day if/elif ladder; only whole-day differences
+        # (int or integral float, e.g. 2.0) hit the table, as with the old == checks
+        table_index = int(difference)
+        if table_index == difference and table_index < len(self._TRIP_LENGTH_FIT_TABLE):
+            return self._TRIP_LENGTH_FIT_TABLE[table_index]
+        
+        # Very large difference - heavy penalty
+        return max(0.25, 1.0 - (difference * 0.12))
     
     def _evaluate_travel_range(self, spot_distance: int, max_distance: int) -> float:
         """
@@ -387,117 +588,140 @@ class TravelSpotRanker:
         Prefer closer destinations within the limit
         """
         if spot_distance <= max_distance:
-            # Prefer closer destinations: bonus for being within range
-            proximity_bonus = 1.0 - (spot_distance / max_distance) * 0.3
-            return min(1.0, proximity_bonus)
-        else:
-            # Beyond user's distance limit
-            excess_distance = spot_distance - max_distance
-            distance_penalty = min(excess_distance / max_distance, 0.5)
-            return max(0.3, 1.0 - distance_penalty)
+            # Prefer closer destinations: bonus for being within range (0.7-1.0, no clamp needed)
+            return 1.0 - (spot_distance / max_distance) * 0.3
+        
+        # Beyond user's distance limit: penalty is capped at 0.5, so the score never drops below 0.5
+        excess_distance = spot_distance - max_distance
+        return 1.0 - min(excess_distance / max_distance, 0.5)
     
-    def explain_score(self, spot_id: int, metadata: Dict, constraints: Dict) -> Dict:
+    def _compute_components(self, spot_id: int, metadata: Dict, constraints: Dict) -> Dict[str, float]:
         """
-        Provide detailed breakdown of score components for a destination.
+        Raw scores of the active components for a single destination.
         
-        Helps users understand why a destination was ranked in a certain position.
+        Scalar counterpart of _score_all_destinations(): the same components are
+        active under the same conditions, so explanations always agree with ranking.
+        
+        Args:
+            spot_id: Destination identifier
+            metadata: Destination information dictionary
+            constraints: Parsed user filter criteria dictionary
+            
+        Returns:
+            Dictionary mapping component name -> raw (unweighted) score
         """
-        explanation_data = {
-            'spot_id': spot_id,
-            'spot_name': metadata['name'],
-            'components': {}
-        }
+        components = {}
+        
+        query_terms = frozenset(term.lower() for term in constraints.get('query_terms') or ())
+        if query_terms:
+            indexer = self.data_indexer
+            if indexer.destination_info.get(spot_id) is metadata:
+                content_scores = self._cached_content_scores(indexer.index_version, query_terms)
+                components['content'] = content_scores[indexer.position_by_id[spot_id]]
+            else:
+                # Not this index's entry (hand-built or unknown id): score the given text fields
+                components['content'] = self._evaluate_content_fields(metadata, query_terms)
         
-        # Financial fit (25% weight) - HIGHEST IMPACT
         if constraints.get('budget_max'):
-            financial_score = self._evaluate_financial_fit(
+            components['budget'] = self._evaluate_financial_fit(
                 metadata['budget_min'],
                 metadata['budget_max'],
                 constraints['budget_max'],
                 constraints.get('budget_min')
             )
-            
-            if constraints.get('budget_min'):
-                reason_text = f"Budget ₹{metadata['budget_min']}-{metadata['budget_max']}, you want ₹{constraints['budget_min']}-{constraints['budget_max']}"
-            else:
-                reason_text = f"Budget ₹{metadata['budget_min']}-{metadata['budget_max']}, you have ₹{constraints['budget_max']}"
-                
-            explanation_data['components']['budget'] = {
-                'score': round(financial_score * 0.25, 3),
-                'reason': reason_text
-            }
-        else:
-            explanation_data['components']['budget'] = {
-                'score': round(0.5 * 0.25, 3),
-                'reason': "No budget specified (default score)"
-            }
         
-        # Atmosphere (25% weight)
         if constraints.get('mood'):
-            atmosphere_score = self._evaluate_atmosphere_match(metadata['mood'], constraints['mood'])
-            explanation_data['components']['mood'] = {
-                'score': round(atmosphere_score * 0.25, 3),
-                'reason': f"Moods: {metadata['mood']}, you want: {constraints['mood']}"
-            }
-        else:
-            explanation_data['components']['mood'] = {
-                'score': round(0.5 * 0.25, 3),
-                'reason': "No mood specified (default score)"
-            }
+            # Indexed metadata carries a precomputed set; hand-built metadata falls back to 'mood'
+            spot_moods = metadata.get('_mood_set')
+            if spot_moods is None:
+                spot_moods = frozenset(metadata['mood'])
+            components['mood'] = self._evaluate_atmosphere_match(spot_moods, set(constraints['mood']))
         
-        # Destination Category (20% weight)
-        category_boost = self._evaluate_category_boost(metadata['name'], constraints)
-        explanation_data['components']['destination_type'] = {
-            'score': round(category_boost * 0.20, 3),
-            'reason': f"Destination type: '{metadata['name']}' (boost: {category_boost})"
-        }
+        if constraints.get('duration_days') is not None:
+            components['duration'] = self._evaluate_trip_length_fit(metadata['duration_days'], constraints['duration_days'])
         
-        # Timing Preferences (15% weight)
-        if constraints.get('best_months'):
-            timing_boost = self._evaluate_timing_match(
-                metadata.get('best_months', []),
-                constraints['best_months']
-            )
-            explanation_data['components']['best_months'] = {
-                'score': round(timing_boost * 0.15, 3),
-                'reason': f"Best months: {metadata.get('best_months', [])}, you prefer: {constraints['best_months']}"
-            }
-        else:
-            explanation_data['components']['best_months'] = {
-                'score': round(0.5 * 0.15, 3),
-                'reason': "No months specified (default score)"
-            }
+        category_boost = metadata.get('_category_boost')
+        if category_boost is None:
+            category_boost = self._evaluate_category_boost(metadata['name'], constraints)
+        components['destination_type'] = category_boost
         
-        # Trip Length (10% weight)
-        if constraints.get('duration_days'):
-            trip_length_score = self._evaluate_trip_length_fit(
-                metadata['duration_days'],
-                constraints['duration_days']
-            )
-            explanation_data['components']['duration'] = {
-                'score': round(trip_length_score * 0.10, 3),
-                'reason': f"Duration {metadata['duration_days']} days, you have {constraints['duration_days']} days"
-            }
-        else:
-            explanation_data['components']['duration'] = {
-                'score': round(0.5 * 0.10, 3),
-                'reason': "No duration specified (default score)"
-            }
+        if constraints.get('best_months'):
+            spot_months = metadata.get('_best_months_set')
+            if spot_months is None:
+                spot_months = frozenset(metadata.get('best_months') or ())
+            components['best_months'] = self._evaluate_timing_match(spot_months, set(constraints['best_months']))
         
-        # Travel Range (5% weight)
         if constraints.get('distance_km'):
-            range_score = self._evaluate_travel_range(
-                metadata['distance_km'],
-                constraints['distance_km']
-            )
-            explanation_data['components']['distance'] = {
-                'score': round(range_score * 0.05, 3),
-                'reason': f"Distance {metadata['distance_km']}km, your limit {constraints['distance_km']}km"
-            }
-        else:
-            explanation_data['components']['distance'] = {
-                'score': round(0.5 * 0.05, 3),
-                'reason': "No distance specified (default score)"
-            }
+            components['distance'] = self._evaluate_travel_range(metadata['distance_km'], constraints['distance_km'])
+        
+        return components
+    
+    def _describe_component(self, component_name: str, metadata: Dict, constraints: Dict, component_score: float) -> str:
+        """
+        Human-readable reason for an active component's score.
+        
+        Args:
+            component_name: Key of COMPONENT_WEIGHTS
+            metadata: Destination information dictionary
+            constraints: Parsed user filter criteria dictionary
+            component_score: Raw score of the component
+            
+        Returns:
+            Reason text shown next to the component score
+        """
+        if component_name == 'content':
+            return f"Search terms: {sorted(constraints['query_terms'])} in '{metadata['name']}'"
+        if component_name == 'budget':
+            if constraints.get('budget_min'):
+                return f"Budget ₹{metadata['budget_min']}-{metadata['budget_max']}, you want ₹{constraints['budget_min']}-{constraints['budget_max']}"
+            return f"Budget ₹{metadata['budget_min']}-{metadata['budget_max']}, you have ₹{constraints['budget_max']}"
+        if component_name == 'mood':
+            return f"Moods: {metadata['mood']}, you want: {constraints['mood']}"
+        if component_name == 'duration':
+            return f"Duration {metadata['duration_days']} days, you have {constraints['duration_days']} days"
+        if component_name == 'destination_type':
+            return f"Destination type: '{metadata['name']}' (boost: {component_score})"
+        if component_name == 'best_months':
+            return f"Best months: {metadata['best_months']}, you prefer: {constraints['best_months']}"
+        return f"Distance {metadata['distance_km']}km, your limit {constraints['distance_km']}km"
+    
+    def explain_score(self, spot_id: int, metadata: Dict, constraints: Dict,
+                      cached_components: Optional[Dict] = None) -> Dict:
+        """
+        Provide detailed breakdown of score components for a destination.
+        
+        Helps users understand why a destination was ranked in a certain position.
+        Component scores are weighted with COMPONENT_WEIGHTS, the same weights used
+        for ranking, so the parts add up to the destination's relevance score.
+        
+        Args:
+            spot_id: Destination identifier
+            metadata: Destination information dictionary
+            constraints: Parsed user filter criteria dictionary
+            cached_components: Raw component scores for this destination from
+                               rank_spots(..., explain=True); when given, nothing
+                               is recomputed
+        """
+        if cached_components is None:
+            cached_components = self._compute_components(spot_id, metadata, constraints)
+        
+        explanation_data = {
+            'spot_id': spot_id,
+            'spot_name': metadata['name'],
+            'components': {}
+        }
+        
+        for component_name, component_weight in self.COMPONENT_WEIGHTS.items():
+            component_score = cached_components.get(component_name)
+            if component_score is None:
+                explanation_data['components'][component_name] = {
+                    'score': round(self._NEUTRAL_CONTRIBUTIONS[component_name], 3),
+                    'reason': self._DEFAULT_COMPONENT_REASONS[component_name]
+                }
+            else:
+                explanation_data['components'][component_name] = {
+                    'score': round(component_score * component_weight, 3),
+                    'reason': self._describe_component(component_name, metadata, constraints, component_score)
+                }
         
         return explanation_data
@@ -9,8 +9,9 @@ Delivers a comprehensive Information Retrieval workflow:
 Development Team: Destination Discovery Platform
 Release: 2.0
 """
+import functools
 import logging
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from src.indexer import TravelSpotIndexer
 from src.query_processor import QueryProcessor
@@ -31,6 +32,9 @@ class TravelSpotRecommendationSystem:
     - Ranker: Computes and orders destinations based on filters
     """
     
+    # Maximum number of distinct (query, top_k) responses kept per engine
+    RESPONSE_CACHE_SIZE = 256
+    
     def __init__(self, dataset_path: str):
         """
         Set up the recommendation engine with dataset.
@@ -43,19 +47,56 @@ class TravelSpotRecommendationSystem:
             json.JSONDecodeError: If dataset file has invalid JSON
         """
         try:
-            self.data_indexer = TravelSpotIndexer()
-            self.query_interpreter = QueryProcessor()
+            data_indexer = TravelSpotIndexer()
             
             # Import and index dataset
-            self.data_indexer.load_dataset(dataset_path)
-            self.data_indexer.build_index()
+            data_indexer.load_dataset(dataset_path)
+            data_indexer.build_index()
             
-            self.scoring_engine = TravelSpotRanker(self.data_indexer)
-            logger.info(f"Engine initialized with {len(self.data_indexer.destination_info)} destinations")
+            self._attach_indexer(data_indexer)
+            logger.info("Engine initialized with %d destinations", len(self.data_indexer.destination_info))
         except Exception as initialization_error:
-            logger.error(f"Failed to initialize recommendation engine: {str(initialization_error)}")
+            logger.error("Failed to initialize recommendation engine: %s", initialization_error)
             raise
     
+    @classmethod
+    def from_indexer(cls, data_indexer: TravelSpotIndexer) -> 'TravelSpotRecommendationSystem':
+        """
+        Create an engine over an already-built indexer, skipping load and index build.
+        
+        The indexer is shared, not copied; rebuilding it later invalidates this
+        engine's caches through the index version.
+        
+        Args:
+            data_indexer: Indexer on which build_index() has already run
+            
+        Returns:
+            Recommendation engine backed by the given indexer
+            
+        Raises:
+            ValueError: If the indexer has not been built yet
+        """
+        if data_indexer.index_version == 0:
+            raise ValueError("Indexer must be built before creating an engine from it")
+        engine = cls.__new__(cls)
+        engine._attach_indexer(data_indexer)
+        return engine
+    
+    def _attach_indexer(self, data_indexer: TravelSpotIndexer) -> None:
+        """
+        Wire the query parser, ranker and response caches around a built indexer.
+        
+        Args:
+            data_indexer: Indexer on which build_index() has already run
+        """
+        self.data_indexer = data_indexer
+        self.query_interpreter = QueryProcessor()
+        self.scoring_engine = TravelSpotRanker(self.data_indexer)
+        # Per-instance LRU cache of formatted responses (keyed by index version too)
+        self._cached_responses = functools.lru_cache(maxsize=self.RESPONSE_CACHE_SIZE)(self._build_response)
+        # Formatted catalog for get_all_spots(), rebuilt only when the index version changes
+        self._cached_catalog = functools.lru_cache(maxsize=1)(self._build_catalog)
+    
     def recommend_with_explanation(self, user_query: str, top_k: int = 10) -> Dict:
         """
         Get destination recommendations with complete details and explanation.
@@ -70,45 +111,69 @@ class TravelSpotRecommendationSystem:
             - total_results: Total number of matching results
             - parsed_constraints: The filters extracted from query
         """
-        try:
-            # Phase 1: Interpret query to extract filters
-            extracted_filters = self.query_interpreter.process_query(user_query)
-            logger.debug(f"Query interpreted: {extracted_filters}")
-            
-            # Phase 2: Score destinations based on filters
-            scored_destinations = self.scoring_engine.rank_spots(extracted_filters, top_k=top_k)
-            
-            # Phase 3: Format results for output
-            formatted_recommendations = []
-            for position, (destination_id, relevance_score, destination_data) in enumerate(scored_destinations, 1):
-                recommendation_entry = {
-                    'rank': position,
-                    'spot_id': destination_id,
-                    'name': destination_data['name'],
-                    'relevance_score': round(relevance_score, 4),
-                    'moods': destination_data['mood'],
-                    'budget_range': f"₹{destination_data['budget_min']}-{destination_data['budget_max']}",
-                    'budget_min': destination_data['budget_min'],
-                    'budget_max': destination_data['budget_max'],
-                    'duration_days': destination_data['duration_days'],
-                    'distance_km': destination_data['distance_km'],
-                    'rating': destination_data['rating'],
-                    'best_months': destination_data.get('best_months', []),
-                    'description': destination_data['description']
-                }
-                formatted_recommendations.append(recommendation_entry)
-            
-            logger.info(f"Generated {len(formatted_recommendations)} recommendations for query: '{user_query}'")
-            
-            return {
-                'recommendations': formatted_recommendations,
-                'total_results': len(formatted_recommendations),
-                'parsed_constraints': extracted_filters
+        if isinstance(user_query, str):
+            # Repeated queries are served from cache; stale after an index rebuild.
+            # The parser only sees the lowercased, stripped text, so key on that.
+            recommendations, extracted_filters = self._cached_responses(
+                user_query.lower().strip(), top_k, self.data_indexer.index_version
+            )
+        else:
+            # Unhashable/invalid input: let the query processor raise its own error
+            recommendations, extracted_filters = self._build_response(user_query, top_k, self.data_indexer.index_version)
+        
+        # Log the text as submitted; the normalised form is only the cache key
+        logger.info("Generated %d recommendations for query: '%s'", len(recommendations), user_query)
+        
+        # Hand out fresh containers so callers cannot mutate cached entries
+        return {
+            'recommendations': [dict(recommendation) for recommendation in recommendations],
+            'total_results': len(recommendations),
+            'parsed_constraints': {
+                filter_name: list(filter_value) if isinstance(filter_value, list) else filter_value
+                for filter_name, filter_value in extracted_filters.items()
             }
+        }
+    
+    def _build_response(self, user_query: str, top_k: int, index_version: int) -> Tuple[Tuple[Dict, ...], Dict]:
+        """
+        Interpret, score and format a query (cache-miss path).
+        
+        Args:
+            user_query: Natural language query from user
+            top_k: Number of recommendations to return
+            index_version: Indexer build counter, so rebuilds never hit stale entries
             
-        except Exception as processing_error:
-            logger.error(f"Error generating recommendations: {str(processing_error)}")
-            raise
+        Returns:
+            Tuple of (formatted recommendations, parsed constraints)
+        """
+        # Phase 1: Interpret query to extract filters
+        extracted_filters = self.query_interpreter.process_query(user_query)
+        logger.debug("Query interpreted: %s", extracted_filters)
+        
+        # Phase 2: Score destinations based on filters
+        scored_destinations = self.scoring_engine.rank_spots(extracted_filters, top_k=top_k)
+        
+        # Phase 3: Format results for output
+        formatted_recommendations = [
+            {
+                'rank': position,
+                'spot_id': destination_id,
+                'name': destination_data['name'],
+                'relevance_score': round(relevance_score, 4),
+                'moods': destination_data['mood'],
+                'budget_range': destination_data['_budget_range'],
+                'budget_min': destination_data['budget_min'],
+                'budget_max': destination_data['budget_max'],
+                'duration_days': destination_data['duration_days'],
+                'distance_km': destination_data['distance_km'],
+                'rating': destination_data['rating'],
+                'best_months': destination_data['best_months'],
+                'description': destination_data['description']
+            }
+            for position, (destination_id, relevance_score, destination_data) in enumerate(scored_destinations, 1)
+        ]
+        
+        return tuple(formatted_recommendations), extracted_filters
 
     def recommend(self, user_query: str, top_k: int = 10) -> List[Dict]:
         """
@@ -117,7 +182,23 @@ class TravelSpotRecommendationSystem:
         """
         output = self.recommend_with_explanation(user_query, top_k)
         return output['recommendations']
-    
+
+    def recommend_batch(self, user_queries: List[str], top_k: int = 10) -> List[Dict]:
+        """
+        Get recommendations with explanations for several queries at once.
+
+        Each distinct query is interpreted and scored once; repeats within the
+        batch (and across batches) are served from the response cache.
+
+        Args:
+            user_queries: Natural language queries, answered in order
+            top_k: Number of recommendations to return per query
+
+        Returns:
+            List of recommend_with_explanation() results, one per input query
+        """
+        return [self.recommend_with_explanation(user_query, top_k) for user_query in user_queries]
+
     def get_all_spots(self) -> List[Dict]:
         """
         Get all indexed destinations.
@@ -127,27 +208,36 @@ class TravelSpotRecommendationSystem:
         Returns:
             List of all destinations with basic metadata
         """
-        try:
-            all_destinations = [
-                {
-                    'id': destination_id,
-                    'name': destination_data['name'],
-                    'moods': destination_data['mood'],
-                    'budget': f"₹{destination_data['budget_min']}-{destination_data['budget_max']}",
-                    'budget_min': destination_data['budget_min'],
-                    'budget_max': destination_data['budget_max'],
-                    'duration': f"{destination_data['duration_days']} days",
-                    'duration_days': destination_data['duration_days'],
-                    'distance': f"{destination_data['distance_km']} km",
-                    'distance_km': destination_data['distance_km'],
-                    'rating': destination_data['rating'],
-                    'best_months': destination_data.get('best_months', []),
-                    'description': destination_data['description']
-                }
-                for destination_id, destination_data in self.data_indexer.destination_info.items()
-            ]
-            logger.info(f"Returned {len(all_destinations)} total destinations")
-            return all_destinations
-        except Exception as retrieval_error:
-            logger.error(f"Error retrieving all destinations: {str(retrieval_error)}")
-            raise
+        # Catalog rows only change on rebuild; copy so callers cannot mutate the cache
+        all_destinations = [dict(destination) for destination in self._cached_catalog(self.data_indexer.index_version)]
+        logger.info("Returned %d total destinations", len(all_destinations))
+        return all_destinations
+
+    def _build_catalog(self, index_version: int) -> Tuple[Dict, ...]:
+        """
+        Format every indexed destination for catalog display (cache-miss path).
+        
+        Args:
+            index_version: Indexer build counter, so rebuilds never hit stale entries
+            
+        Returns:
+            Tuple of formatted destination rows in index order
+        """
+        return tuple(
+            {
+                'id': destination_id,
+                'name': destination_data['name'],
+                'moods': destination_data['mood'],
+                'budget': destination_data['_budget_range'],
+                'budget_min': destination_data['budget_min'],
+                'budget_max': destination_data['budget_max'],
+                'duration': destination_data['_duration_label'],
+                'duration_days': destination_data['duration_days'],
+                'distance': destination_data['_distance_label'],
+                'distance_km': destination_data['distance_km'],
+                'rating': destination_data['rating'],
+                'best_months': destination_data['best_months'],
+                'description': destination_data['description']
+            }
+            for destination_id, destination_data in self.data_indexer.destination_info.items()
+        )
@@ -3,6 +3,7 @@ import sys
 import os
 from pathlib import Path
 import json
+import bisect
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -45,53 +46,21 @@ def calculate_metrics():
     print(f"{'Query':<30} | {'P@5':<6} | {'R@5':<6} | {'F1':<6}")
     print("-" * 60)
     
-    for test in test_queries:
+    # Destinations sorted by minimum budget, so budget ground truth is a bisect
+    budget_order = sorted(
+        (spot['budget_min'], spot_id) for spot_id, spot in system.data_indexer.destination_info.items()
+    )
+    
+    batch_results = system.recommend_batch([test['query'] for test in test_queries], top_k=5)
+    
+    for test, results in zip(test_queries, batch_results):
         query = test['query']
-        results = system.recommend_with_explanation(query, top_k=5)
         # Slice to Top 5 for P@5 and R@5 metrics
         retrieved_docs = results['recommendations'][:5]
         
         # Determine Ground Truth (Relevant Docs in entire dataset)
-        relevant_docs_count = 0
-        relevant_ids = set()
-        
-        for spot_id, spot in system.data_indexer.destination_info.items():
-            is_relevant = False
-            
-            if test['type'] == 'keyword':
-                # Check if term in name, mood, or description
-                term = test['term']
-                text = (spot['name'] + ' ' + spot['description'] + ' ' + ' '.join(spot['mood'])).lower()
-                # Simple check: if term is in text OR if synonym logic applies (e.g. mountain/hill)
-                if term in text:
-                    is_relevant = True
-                elif term == 'mountain' and 'hill' in text:
-                    is_relevant = True
-                elif term == 'hill' and 'mountain' in text:
-                    is_relevant = True
-                    
-            elif test['type'] == 'mood':
-                if test['term'] in [m.lower() for m in spot['mood']]:
-                    is_relevant = True
-                    
-            elif test['type'] == 'budget':
-                if spot['budget_min'] <= test['max']:
-                    is_relevant = True
-            
-            elif test['type'] == 'name':
-                if test['term'] in spot['name'].lower():
-                    is_relevant = True
-                    
-            elif test['type'] == 'mixed':
-                # Must match BOTH
-                mood_match = test['mood'] in [m.lower() for m in spot['mood']]
-                budget_match = spot['budget_min'] <= test['budget']
-                if mood_match and budget_match:
-                    is_relevant = True
-            
-            if is_relevant:
-                relevant_docs_count += 1
-                relevant_ids.add(spot_id)
+        relevant_ids = relevant_spot_ids(system, test, budget_order)
+        relevant_docs_count = len(relevant_ids)
         
         # Calculate P@5 and R@5 for this query
         retrieved_relevant = 0
@@ -132,6 +101,46 @@ def calculate_metrics():
     # Update the markdown file with REAL values
     update_markdown(avg_precision, avg_recall, avg_f1)
 
+def relevant_spot_ids(system, test, budget_order):
+    """Return the ids of every destination relevant to a test query."""
+    indexer = system.data_indexer
+    
+    if test['type'] == 'mood':
+        return set(indexer.get_spots_by_mood(test['term']))
+    
+    if test['type'] == 'budget':
+        return within_budget(budget_order, test['max'])
+    
+    if test['type'] == 'mixed':
+        # Must match BOTH
+        return indexer.get_spots_by_mood(test['mood']) & within_budget(budget_order, test['budget'])
+    
+    if test['type'] == 'keyword':
+        # Term in name, description or mood; mountain/hill count as synonyms
+        terms = {test['term']}
+        if test['term'] == 'mountain':
+            terms.add('hill')
+        elif test['term'] == 'hill':
+            terms.add('mountain')
+        return {
+            spot_id for spot_id, spot in indexer.destination_info.items()
+            if any(term in spot['_name_lower'] or term in spot['_description_lower'] or term in spot['_mood_text']
+                   for term in terms)
+        }
+    
+    if test['type'] == 'name':
+        return {
+            spot_id for spot_id, spot in indexer.destination_info.items()
+            if test['term'] in spot['_name_lower']
+        }
+    
+    return set()
+
+def within_budget(budget_order, max_budget):
+    """Return ids whose minimum budget is at most max_budget."""
+    cutoff = bisect.bisect_right(budget_order, (max_budget, float('inf')))
+    return {spot_id for _, spot_id in budget_order[:cutoff]}
+
 def update_markdown(p, r, f1):
     filepath = os.path.join(os.path.dirname(__file__), '..', 'experimentation_results.md')
     
@@ -1,24 +1,35 @@
 """
 Unit tests for Travel Spot Recommendation System
 """
+import functools
 import unittest
 import json
+import math
 import os
+import re
 import sys
+import tempfile
 from src.indexer import TravelSpotIndexer
 from src.query_processor import QueryProcessor
 from src.ranker import TravelSpotRanker
 from src.recommendation_system import TravelSpotRecommendationSystem
 
+DATASET_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'travel_spots.json')
+
+
+@functools.lru_cache(maxsize=None)
+def shared_system():
+    """Build the recommendation system once per test run; tests only read its index."""
+    return TravelSpotRecommendationSystem(DATASET_PATH)
+
 
 class TestIndexer(unittest.TestCase):
     """Test indexing functionality"""
     
-    def setUp(self):
-        self.indexer = TravelSpotIndexer()
-        dataset_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'travel_spots.json')
-        self.indexer.load_dataset(dataset_path)
-        self.indexer.build_index()
+    @classmethod
+    def setUpClass(cls):
+        # Tests only read the index, so every class shares one build
+        cls.indexer = shared_system().data_indexer
     
     def test_dataset_loaded(self):
         """Test that dataset is loaded correctly"""
@@ -60,6 +71,76 @@ class TestIndexer(unittest.TestCase):
         idf = self.indexer.calculate_idf('xyzabc12345')
         self.assertEqual(idf, 0.0)
     
+    def test_idf_matches_precomputed(self):
+        """Test that precomputed IDF values match the log(N / df) formula"""
+        beach_spots = len(self.indexer.reverse_term_map['beach'])
+        expected = math.log(len(self.indexer.destination_info) / beach_spots)
+        self.assertAlmostEqual(self.indexer.calculate_idf('beach'), expected)
+    
+    def test_term_match_postings_and_bounded_cache(self):
+        """Test that indexed words use build-time postings and other terms a bounded LRU cache"""
+        cache_info = self.indexer._cached_term_matches.cache_info
+        self.assertIsNotNone(cache_info().maxsize)
+        misses_before = cache_info().misses
+        self.assertEqual(self.indexer.get_term_match_positions('beach'), self.indexer._scan_term_matches('beach'))
+        self.assertEqual(cache_info().misses, misses_before)
+        
+        # Substring matches outside the vocabulary still resolve ('eac' occurs inside 'beach')
+        title_matches, _, _ = self.indexer.get_term_match_positions('eac')
+        self.assertTrue(title_matches)
+        self.assertEqual(cache_info().misses, misses_before + 1)
+    
+    def test_derived_fields_precomputed(self):
+        """Test that lowercased text and category boost are stored at index time"""
+        spot = self.indexer.get_spot_by_id(1)
+        self.assertEqual(spot['_name_lower'], spot['name'].lower())
+        self.assertEqual(spot['_description_lower'], spot['description'].lower())
+        self.assertEqual(spot['_mood_text'], ' '.join(spot['mood']).lower())
+        self.assertIn(spot['_category_boost'], (0.9, 0.85, 0.75, 0.5))
+        self.assertEqual(spot['_duration_label'], f"{spot['duration_days']} days")
+        self.assertEqual(spot['_distance_label'], f"{spot['distance_km']} km")
+    
+    def test_mood_tags_lowercased_and_shared(self):
+        """Test that equal mood tags on different destinations are the same string object"""
+        adventure_tags = [
+            tag for spot in self.indexer.destination_info.values()
+            for tag in spot['mood'] if tag == 'adventure'
+        ]
+        self.assertGreater(len(adventure_tags), 1)
+        self.assertTrue(all(tag is adventure_tags[0] for tag in adventure_tags))
+    
+    def test_category_tier_priority(self):
+        """Test that the highest tier wins even when a lower tier keyword comes first"""
+        self.assertEqual(self.indexer._classify_category('city beach walk'), 0.9)
+        self.assertEqual(self.indexer._classify_category('night trek to ladakh'), 0.85)
+        self.assertEqual(self.indexer._classify_category('old town'), 0.5)
+    
+    def test_mood_masks_match_mood_tags(self):
+        """Test that mood bitmasks encode exactly each destination's mood tags"""
+        for spot_mask, metadata in zip(self.indexer.mood_mask_column, self.indexer.metadata_column):
+            self.assertEqual(spot_mask.bit_count(), len(set(metadata['mood'])))
+            self.assertEqual(spot_mask, self.indexer.encode_moods(metadata['mood']))
+        self.assertEqual(self.indexer.encode_moods(['nonexistent_mood']), 0)
+    
+    def test_non_integer_numeric_fields(self):
+        """Test that float budgets/durations and non-int ids index and rank like the source data"""
+        with open(DATASET_PATH, encoding='utf-8') as dataset_file:
+            dataset = json.load(dataset_file)
+        dataset['travel_spots'][0]['budget_min'] = 2500.0
+        dataset['travel_spots'][1]['duration_days'] = 2.0
+        dataset['travel_spots'][2]['id'] = 'spot-3'
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dataset_path = os.path.join(temp_dir, 'travel_spots.json')
+            with open(dataset_path, 'w', encoding='utf-8') as dataset_file:
+                json.dump(dataset, dataset_file)
+            indexer = TravelSpotIndexer()
+            indexer.load_dataset(dataset_path)
+            indexer.build_index()
+        self.assertEqual(indexer.get_spot_by_id('spot-3')['name'], dataset['travel_spots'][2]['name'])
+        ranker = TravelSpotRanker(indexer)
+        results = ranker.rank_spots({'budget_max': 9000, 'duration_days': 2}, top_k=40)
+        self.assertIn(dataset['travel_spots'][0]['id'], [spot_id for spot_id, _, _ in results])
+    
     def test_build_index_validation(self):
         """Test that build_index validates dataset is loaded"""
         empty_indexer = TravelSpotIndexer()
@@ -161,6 +242,25 @@ class TestQueryProcessor(unittest.TestCase):
         self.assertNotIn('want', query_terms)
         self.assertNotIn('find', query_terms)
     
+    def test_query_terms_cached_per_text(self):
+        """Test that repeated query text reuses tokenization without sharing term lists"""
+        first = self.processor.process_query("Beaches and mountains")
+        first['query_terms'].append('changed')
+        second = self.processor.process_query("  beaches and MOUNTAINS ")
+        self.assertEqual(self.processor._term_cache.cache_info().hits, 1)
+        self.assertEqual(sorted(second['query_terms']), ['beach', 'hill', 'mountain'])
+    
+    def test_patterns_are_compiled_once(self):
+        """Test that extraction patterns are compiled class attributes shared by every instance"""
+        other = QueryProcessor()
+        for group_name in ('_BUDGET_RANGE_PATTERNS', '_BUDGET_SINGLE_PATTERNS', '_DURATION_PATTERNS', '_DISTANCE_PATTERNS'):
+            with self.subTest(group=group_name):
+                patterns = getattr(QueryProcessor, group_name)
+                self.assertIs(getattr(self.processor, group_name), patterns)
+                self.assertIs(getattr(other, group_name), patterns)
+                self.assertTrue(all(isinstance(pattern, re.Pattern) for pattern in patterns))
+        self.assertIsInstance(QueryProcessor._VIBE_PATTERN, re.Pattern)
+    
     def test_user_location_extraction(self):
         """Test extraction of user location from query"""
         query = "I want to visit tirupathi temple"
@@ -177,11 +277,12 @@ class TestQueryProcessor(unittest.TestCase):
 class TestRanker(unittest.TestCase):
     """Test ranking functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        cls.indexer = shared_system().data_indexer
+    
     def setUp(self):
-        self.indexer = TravelSpotIndexer()
-        dataset_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'travel_spots.json')
-        self.indexer.load_dataset(dataset_path)
-        self.indexer.build_index()
+        # Fresh ranker per test so cache statistics never leak between tests
         self.ranker = TravelSpotRanker(self.indexer)
     
     def test_ranking_returns_results(self):
@@ -204,6 +305,15 @@ class TestRanker(unittest.TestCase):
         results = self.ranker.rank_spots(constraints, top_k=3)
         self.assertEqual(len(results), 3)
     
+    def test_top_k_matches_full_sort(self):
+        """Test that partial top-k selection returns the head of the full ranking"""
+        constraints = {'budget_max': 10000, 'mood': ['nature'], 'duration_days': 3,
+                       'distance_km': None, 'place_name': None, 'best_months': []}
+        full_ranking = self.ranker.rank_spots(constraints, top_k=len(self.indexer.destination_info))
+        for top_k in (1, 3, 5):
+            with self.subTest(top_k=top_k):
+                self.assertEqual(self.ranker.rank_spots(constraints, top_k=top_k), full_ranking[:top_k])
+    
     def test_invalid_top_k(self):
         """Test that invalid top_k raises ValueError"""
         constraints = {}
@@ -251,11 +361,31 @@ class TestRanker(unittest.TestCase):
         score = self.ranker._calculate_mood_score(spot_moods, user_moods)
         self.assertEqual(score, 0.0)
     
+    def test_mood_score_accepts_frozenset(self):
+        """Test that precomputed mood sets score the same as plain lists"""
+        for spot_moods, user_moods, expected in [
+            (['adventure', 'nature'], ['adventure'], 1.0),
+            (['adventure', 'nature'], ['adventure', 'party'], 0.5),
+            (['adventure'], ['party', 'nightlife'], 0.0),
+        ]:
+            with self.subTest(spot_moods=spot_moods, user_moods=user_moods):
+                self.assertEqual(self.ranker._evaluate_atmosphere_match(frozenset(spot_moods), frozenset(user_moods)), expected)
+                self.assertEqual(self.ranker._evaluate_atmosphere_match(spot_moods, user_moods), expected)
+    
     def test_duration_score_exact_match(self):
         """Test duration scoring with exact match"""
         score = self.ranker._calculate_duration_score(3, 3)
         self.assertEqual(score, 1.0)
     
+    def test_trip_length_fit_table(self):
+        """Test trip length fit lookup table and large-difference fallback"""
+        expected_scores = [1.0, 0.90, 0.75, 0.55, 0.40]
+        for difference, expected in enumerate(expected_scores):
+            self.assertEqual(self.ranker._evaluate_trip_length_fit(3 + difference, 3), expected)
+            self.assertEqual(self.ranker._evaluate_trip_length_fit(10, 10 + difference), expected)
+        self.assertAlmostEqual(self.ranker._evaluate_trip_length_fit(8, 2), 0.28)
+        self.assertEqual(self.ranker._evaluate_trip_length_fit(12, 1), 0.25)
+    
     def test_budget_score_over_max(self):
         """Test budget scoring when spot budget is higher than user budget"""
         # When user budget is lower than spot's budget_max
@@ -264,6 +394,86 @@ class TestRanker(unittest.TestCase):
         self.assertLess(score, 1.0)
         self.assertGreater(score, 0)  # Should not be penalized too harshly
     
+    def test_ranking_cache_hit_and_rebuild(self):
+        """Test that repeated rankings are served from cache until the index is rebuilt"""
+        # Rebuilds mutate the indexer, so use a private one rather than the shared fixture
+        private_indexer = TravelSpotIndexer()
+        private_indexer.load_dataset(DATASET_PATH)
+        private_indexer.build_index()
+        ranker = TravelSpotRanker(private_indexer)
+        
+        constraints = {'budget_max': 5000, 'mood': ['adventure'], 'duration_days': None,
+                      'distance_km': None, 'place_name': None, 'best_months': []}
+        first = ranker.rank_spots(constraints, top_k=5)
+        second = ranker.rank_spots(dict(constraints), top_k=5)
+        self.assertEqual(first, second)
+        self.assertEqual(ranker._cached_rankings.cache_info().hits, 1)
+        
+        # Rebuilding the index must not serve stale rankings
+        private_indexer.build_index()
+        ranker.rank_spots(constraints, top_k=5)
+        self.assertEqual(ranker._cached_rankings.cache_info().hits, 1)
+    
+    def test_explain_reuses_ranking_components(self):
+        """Test that explanations built from ranking components match recomputed ones"""
+        constraints = {'budget_max': 5000, 'mood': ['adventure'], 'duration_days': 3,
+                      'distance_km': 800, 'place_name': None, 'best_months': ['december']}
+        results, component_scores = self.ranker.rank_spots(constraints, top_k=5, explain=True)
+        self.assertEqual(results, self.ranker.rank_spots(constraints, top_k=5))
+        # The timing component must see a real month match, not only zero overlap
+        self.assertIn(1.0, [component_scores[spot_id]['best_months'] for spot_id, _, _ in results])
+        for spot_id, _, metadata in results:
+            self.assertEqual(
+                self.ranker.explain_score(spot_id, metadata, constraints, component_scores[spot_id]),
+                self.ranker.explain_score(spot_id, metadata, constraints)
+            )
+    
+    def test_components_without_derived_fields(self):
+        """Test that mood/month scoring falls back to public fields when derived sets are absent"""
+        constraints = {'budget_max': 8000, 'mood': ['adventure', 'nature'], 'duration_days': 3,
+                      'distance_km': None, 'place_name': None, 'best_months': ['december', 'january']}
+        for spot_id, metadata in self.indexer.destination_info.items():
+            public_metadata = {key: value for key, value in metadata.items()
+                               if key not in ('_mood_set', '_best_months_set')}
+            with self.subTest(spot_id=spot_id):
+                self.assertEqual(self.ranker._compute_components(spot_id, public_metadata, constraints),
+                                 self.ranker._compute_components(spot_id, metadata, constraints))
+    
+    def test_explain_score_with_hand_built_metadata(self):
+        """Test that explain_score accepts plain metadata for destinations outside the index"""
+        metadata = {
+            'name': 'Kodaikanal Hill Station',
+            'mood': ['nature', 'peaceful'],
+            'budget_min': 3000,
+            'budget_max': 6000,
+            'duration_days': 3,
+            'distance_km': 400,
+            'rating': 4.5,
+            'best_months': ['april', 'may'],
+            'description': 'Misty lakes and pine forests'
+        }
+        constraints = {'budget_max': 8000, 'mood': ['nature'], 'duration_days': 3,
+                      'distance_km': None, 'place_name': None, 'best_months': ['may'],
+                      'query_terms': ['lakes', 'kodaikanal']}
+        explanation = self.ranker.explain_score(10_000, metadata, constraints)
+
+        self.assertEqual(explanation['spot_name'], 'Kodaikanal Hill Station')
+        # One of two terms is in the title, so content is half of its weight
+        self.assertAlmostEqual(explanation['components']['content']['score'],
+                               round(0.5 * self.ranker.COMPONENT_WEIGHTS['content'], 3))
+        self.assertGreater(explanation['components']['mood']['score'], 0)
+        self.assertGreater(explanation['components']['destination_type']['score'], 0)
+        self.assertGreater(explanation['components']['best_months']['score'], 0)
+
+    def test_explanation_components_sum_to_score(self):
+        """Test that explanation components use the ranking weights"""
+        constraints = {'budget_max': 5000, 'mood': ['adventure'], 'duration_days': 3,
+                      'distance_km': None, 'place_name': None, 'best_months': []}
+        for spot_id, relevance_score, metadata in self.ranker.rank_spots(constraints, top_k=5):
+            explanation = self.ranker.explain_score(spot_id, metadata, constraints)
+            component_total = sum(part['score'] for part in explanation['components'].values())
+            self.assertAlmostEqual(component_total, relevance_score, delta=0.005)
+    
     def test_ranking_tie_breaker_logic_by_rating(self):
         """Test that ranking uses rating as tie-breaker for identical scores"""
         # Create constraints that would produce similar scores
@@ -294,9 +504,14 @@ class TestRanker(unittest.TestCase):
 class TestRecommendationSystem(unittest.TestCase):
     """Test complete recommendation system"""
     
+    @classmethod
+    def setUpClass(cls):
+        cls.system = shared_system()
+    
     def setUp(self):
-        dataset_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'travel_spots.json')
-        self.system = TravelSpotRecommendationSystem(dataset_path)
+        # Start every test with cold response/catalog caches
+        self.system._cached_responses.cache_clear()
+        self.system._cached_catalog.cache_clear()
     
     def test_recommend_returns_results(self):
         """Test that recommend returns results"""
@@ -304,6 +519,23 @@ class TestRecommendationSystem(unittest.TestCase):
         results = self.system.recommend(query, top_k=5)
         self.assertGreater(len(results), 0)
     
+    def test_repeated_query_served_from_cache(self):
+        """Test that repeated queries hit the response cache without sharing mutable results"""
+        first = self.system.recommend("beach under 5000", top_k=5)
+        first[0]['name'] = 'changed'
+        second = self.system.recommend("beach under 5000", top_k=5)
+        self.assertEqual(self.system._cached_responses.cache_info().hits, 1)
+        self.assertNotEqual(second[0]['name'], 'changed')
+        self.system.recommend("  Beach UNDER 5000 ", top_k=5)
+        self.assertEqual(self.system._cached_responses.cache_info().hits, 2)
+
+    def test_log_uses_submitted_query(self):
+        """Test that the request log shows the query as typed, including on cache hits"""
+        self.system.recommend("beach under 5000", top_k=5)
+        with self.assertLogs('src.recommendation_system', level='INFO') as captured:
+            self.system.recommend("  Beach UNDER 5000 ", top_k=5)
+        self.assertIn("query: '  Beach UNDER 5000 '", captured.output[0])
+
     def test_recommend_with_explanation(self):
         """Test recommend with explanation"""
         query = "Budget 5000, adventure mood"
@@ -312,11 +544,44 @@ class TestRecommendationSystem(unittest.TestCase):
         self.assertIn('parsed_constraints', result)
         self.assertGreater(len(result['recommendations']), 0)
     
+    def test_recommend_batch_matches_single_queries(self):
+        """Test that batch recommendations match one-at-a-time results, in order"""
+        queries = ["beach under 5000", "adventure for 4 days", "beach under 5000"]
+        batch = self.system.recommend_batch(queries, top_k=5)
+        self.assertEqual(len(batch), len(queries))
+        for query, result in zip(queries, batch):
+            self.assertEqual(result, self.system.recommend_with_explanation(query, top_k=5))
+    
+    def test_equal_scores_ordered_by_rating(self):
+        """Test that destinations with equal scores stay in rating order (no summation drift)"""
+        results = self.system.recommend("3 days culture", top_k=5)
+        self.assertEqual([r['spot_id'] for r in results], [8, 24, 29, 16, 11])
+        for higher, lower in zip(results, results[1:]):
+            if higher['relevance_score'] == lower['relevance_score']:
+                self.assertGreaterEqual(higher['rating'], lower['rating'])
+    
+    def test_from_indexer_shares_index(self):
+        """Test that an engine built from an existing indexer reuses it and ranks identically"""
+        engine = TravelSpotRecommendationSystem.from_indexer(self.system.data_indexer)
+        self.assertIs(engine.data_indexer, self.system.data_indexer)
+        query = "adventure for 4 days"
+        self.assertEqual(engine.recommend(query, top_k=5), self.system.recommend(query, top_k=5))
+        with self.assertRaises(ValueError):
+            TravelSpotRecommendationSystem.from_indexer(TravelSpotIndexer())
+    
     def test_get_all_spots(self):
         """Test getting all spots"""
         spots = self.system.get_all_spots()
         self.assertGreater(len(spots), 0)
     
+    def test_get_all_spots_cached_per_index_version(self):
+        """Test that the catalog is formatted once and callers get their own copies"""
+        first = self.system.get_all_spots()
+        first[0]['name'] = 'changed'
+        second = self.system.get_all_spots()
+        self.assertEqual(self.system._cached_catalog.cache_info().misses, 1)
+        self.assertNotEqual(second[0]['name'], 'changed')
+    
     def test_result_format(self):
         """Test result format"""
         query = "Budget 3000"